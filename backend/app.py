@@ -1,19 +1,37 @@
-from fastapi import FastAPI
+from fastapi import FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse
+from fastapi.staticfiles import StaticFiles
 from starlette.middleware.sessions import SessionMiddleware
 import uvicorn
 import os
 
 import database
-from routers import student, mentor
+from routers import student, mentor, admin
+from security import HASH_WORKERS, hash_queue_depth, principal_cache, token_cache
+from services.mentor_stats import stats_cache
+from utils import metrics
 from utils.auth import router as auth_router
+from utils.compression import CompressionMiddleware
+from utils.image_upload import UPLOAD_WORKERS, upload_queue_depth
+from utils.oidc import close_http
+from utils.profile_cache import profile_cache
+from utils.profiling import ProfilingMiddleware
+from utils.query_stats import query_stats_middleware
+from utils.responses import FastJSONResponse
+from utils.storage import STORAGE_BACKEND, MEDIA_ROOT, MEDIA_URL
 
-app = FastAPI()
+app = FastAPI(default_response_class=FastJSONResponse)
+app.router.add_event_handler("shutdown", close_http)
 
 # Add SessionMiddleware for OAuth
 SECRET_KEY = os.getenv("SECRET_KEY", "supersecret")
 app.add_middleware(SessionMiddleware, secret_key=SECRET_KEY)
 
+# Inside query_stats_middleware, which records the profiled SQL timeline.
+app.add_middleware(ProfilingMiddleware)
+app.middleware("http")(query_stats_middleware)
+
 # CORS
 origins = [
     "http://localhost:3000",  # React frontend
@@ -26,15 +44,37 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+app.add_middleware(CompressionMiddleware)
+app.add_middleware(metrics.MetricsMiddleware)
+
+metrics.register_executor("bcrypt", hash_queue_depth, HASH_WORKERS)
+metrics.register_executor("upload", upload_queue_depth, UPLOAD_WORKERS)
+metrics.register_cache("token", token_cache)
+metrics.register_cache("principal", principal_cache)
+metrics.register_cache("stats", stats_cache)
+if hasattr(profile_cache, "cache"):  # in-process backend only; Redis keeps its own stats
+    metrics.register_cache("profile", profile_cache.cache)
+
 database.create_db_and_tables()
 
 app.include_router(student.router)
 app.include_router(mentor.router)
+app.include_router(admin.router)
+
+if STORAGE_BACKEND == "local":
+    os.makedirs(MEDIA_ROOT, exist_ok=True)
+    app.mount(MEDIA_URL, StaticFiles(directory=MEDIA_ROOT), name="media")
 
 @app.get("/health-check")
 def health_check():
     return {"message": "Server running..."}
 
+@app.get("/metrics", include_in_schema=False)
+def get_metrics(request: Request):
+    if metrics.METRICS_TOKEN and request.headers.get("authorization") != f"Bearer {metrics.METRICS_TOKEN}":
+        raise HTTPException(status_code=401, detail="Invalid metrics token")
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
+
 app.include_router(auth_router, prefix="/api")
 
 if __name__ == "__main__":
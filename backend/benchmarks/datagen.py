@@ -0,0 +1,187 @@
+"""Seeded synthetic data: mentors and students with full profiles.
+
+Every student gets a filled-in PersonalInfo (search_text included), eight
+semesters of Mark rows in the free-text formats real data uses, an
+Achievement, a few Counseling entries and the matching AcademicSummary.
+The same --seed always produces the same rows, ids included, so benchmark
+runs are comparable.
+
+Usage (from backend/):
+    python -m benchmarks.datagen --db-url sqlite:///bench.db --mentors 40 --students 2000
+
+Mentors are mentor{i}@atharva.edu and students student{i}@atharva.edu;
+every mentor's password is MENTOR_PASSWORD.
+"""
+import argparse
+import os
+import random
+import time
+import uuid
+from dataclasses import dataclass, field
+from typing import List
+
+from sqlalchemy import create_engine, insert
+from sqlmodel import Session, SQLModel
+
+from models import AcademicSummary, Achievement, Counseling, Mark, Mentor, PersonalInfo, Student
+from models.mark import Sem
+from services.academic_summary import summarize
+
+MENTOR_PASSWORD = "bench-password"
+INSERT_CHUNK = 1000
+
+FIRST_NAMES = ["Aarav", "Vivaan", "Aditya", "Ananya", "Diya", "Ishaan", "Kavya", "Meera",
+               "Neha", "Omkar", "Pooja", "Rohan", "Sanika", "Tanvi", "Varun", "Yash"]
+LAST_NAMES = ["Patil", "Shinde", "Deshmukh", "Kulkarni", "Joshi", "Pawar", "Naik", "Gupta",
+              "Sharma", "Iyer", "Fernandes", "Khan", "Mehta", "Rao"]
+DEPARTMENTS = ["Computer", "IT", "EXTC", "Electrical", "Mechanical"]
+SUBJECTS = ["Maths", "Physics", "Chemistry", "Mechanics", "DSA", "DBMS", "OS", "Networks"]
+SPORTS = ["Cricket", "Football", "Chess", "Badminton", "Kabaddi", None, None]
+BLOOD_GROUPS = ["A+", "A-", "B+", "B-", "O+", "O-", "AB+", "AB-"]
+TOPICS = ["Attendance", "Backlog plan", "Internship", "Career guidance", "Health"]
+
+
+@dataclass
+class Dataset:
+    mentor_ids: List[uuid.UUID] = field(default_factory=list)
+    mentor_emails: List[str] = field(default_factory=list)
+    personal_info_ids: List[uuid.UUID] = field(default_factory=list)
+    names: List[str] = field(default_factory=list)
+
+
+def _uuid(rng: random.Random) -> uuid.UUID:
+    return uuid.UUID(int=rng.getrandbits(128), version=4)
+
+
+def _score(rng: random.Random, base: float) -> str:
+    score = max(4.0, min(10.0, base + rng.uniform(-1.2, 1.2)))
+    style = rng.random()
+    if style < 0.7:
+        return f"{score:.2f}"
+    if style < 0.9:
+        return f"{score * 9.5:.0f}%"
+    return f"{score:.1f} CGPA"
+
+
+def _student_rows(rng: random.Random, i: int, student_id, personal_info_id, semester_count: int, search_text):
+    name = f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)} {i}"
+    personal = {
+        "id": personal_info_id, "student_id": student_id, "name": name,
+        "atharva_email": f"student{i}@atharva.edu", "enrollment_no": f"EN{i:06}",
+        "date_of_birth": f"200{rng.randint(0, 6)}-{rng.randint(1, 12):02}-{rng.randint(1, 28):02}",
+        "blood_group": rng.choice(BLOOD_GROUPS),
+        "aadhar_no": f"{rng.randrange(10 ** 11, 10 ** 12)}",
+        "personal_email": f"{name.split()[0].lower()}{i}@example.com",
+        "mobile_no": f"9{rng.randrange(10 ** 8, 10 ** 9)}",
+        "father_name": f"{rng.choice(FIRST_NAMES)} {name.split()[1]}", "father_occupation": "Engineer",
+        "father_mobile": f"9{rng.randrange(10 ** 8, 10 ** 9)}",
+        "mother_name": f"{rng.choice(FIRST_NAMES)} {name.split()[1]}", "mother_occupation": "Teacher",
+        "mother_mobile": f"9{rng.randrange(10 ** 8, 10 ** 9)}",
+        "local_address": f"{rng.randint(1, 300)}, Malad West, Mumbai",
+        "permanent_address": f"{rng.randint(1, 300)}, Station Road, Pune",
+        "ssc": f"{rng.uniform(60, 98):.2f}%", "hsc": f"{rng.uniform(55, 95):.2f}%",
+        "diploma": None, "sport": rng.choice(SPORTS), "other": None,
+        "department": rng.choice(DEPARTMENTS),
+        "photo": f"https://res.cloudinary.com/demo/image/upload/students/{i}.webp",
+        "is_ban": rng.random() < 0.05,
+        "nss_member": rng.random() < 0.2, "ember_member": rng.random() < 0.1,
+        "rhythm_member": rng.random() < 0.1,
+    }
+
+    base = rng.uniform(5.5, 9.5)
+    marks = []
+    for sem in list(Sem)[:semester_count]:
+        kts = rng.choices([0, 1, 2], weights=[85, 11, 4])[0]
+        marks.append({
+            "id": _uuid(rng), "student_id": student_id, "semester": sem.name,
+            "marks": _score(rng, base), "no_of_kt": str(kts),
+            "kt_subject": ", ".join(rng.sample(SUBJECTS, kts)),
+        })
+
+    personal["search_text"] = search_text(PersonalInfo(**personal), marks)
+
+    achievement = {
+        "id": _uuid(rng), "student_id": student_id,
+        "first_year": "Hackathon finalist" if rng.random() < 0.3 else "",
+        "second_year": "Paper presentation" if rng.random() < 0.2 else "",
+        "third_year": "", "final_year": "",
+    }
+    counseling = [
+        {"id": _uuid(rng), "student_id": student_id, "sr_no": n, "topic": rng.choice(TOPICS),
+         "date": f"2026-0{rng.randint(1, 9)}-{rng.randint(1, 28):02}",
+         "action_taken": "Discussed with student", "remark": "Follow up next month", "sign": "Mentor"}
+        for n in range(1, rng.randint(0, 3) + 1)
+    ]
+    return personal, marks, achievement, counseling
+
+
+def generate(engine, mentors: int, students: int, seed: int = 0, semesters: int = len(Sem)) -> Dataset:
+    """Insert the dataset into ``engine``'s (already created) tables."""
+    from security import hash_password
+    from services.search import build_search_text
+
+    rng = random.Random(seed)
+    data = Dataset()
+    password = hash_password(MENTOR_PASSWORD)
+    mentor_rows = []
+    for i in range(mentors):
+        mentor_id = _uuid(rng)
+        data.mentor_ids.append(mentor_id)
+        data.mentor_emails.append(f"mentor{i}@atharva.edu")
+        mentor_rows.append({
+            "id": mentor_id, "email": data.mentor_emails[-1], "password": password,
+            "semester": rng.choice(list(Sem)).name, "mentor_name": f"Mentor {i}",
+            "department": DEPARTMENTS[i % len(DEPARTMENTS)], "capacity": None,
+        })
+
+    rows = {Student: [], PersonalInfo: [], Mark: [], Achievement: [], Counseling: [], AcademicSummary: []}
+    with Session(engine) as session:
+        session.execute(insert(Mentor), mentor_rows)
+        for i in range(students):
+            student_id, personal_info_id = _uuid(rng), _uuid(rng)
+            personal, marks, achievement, counseling = _student_rows(
+                rng, i, student_id, personal_info_id, semesters, build_search_text)
+            data.personal_info_ids.append(personal_info_id)
+            data.names.append(personal["name"])
+            rows[Student].append({"id": student_id, "mentor_id": data.mentor_ids[i % mentors]})
+            rows[PersonalInfo].append(personal)
+            rows[Mark].extend(marks)
+            rows[Achievement].append(achievement)
+            rows[Counseling].extend(counseling)
+            summary = summarize(student_id, marks)
+            if summary:
+                rows[AcademicSummary].append(summary)
+
+            if len(rows[Student]) >= INSERT_CHUNK or i == students - 1:
+                for model, chunk in rows.items():
+                    if chunk:
+                        session.execute(insert(model), chunk)
+                    chunk.clear()
+        session.commit()
+    return data
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--db-url", required=True)
+    parser.add_argument("--mentors", type=int, default=40)
+    parser.add_argument("--students", type=int, default=2000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--drop", action="store_true", help="drop and recreate every table first")
+    args = parser.parse_args()
+
+    # security/services.search import the app's database module.
+    os.environ.setdefault("DB_URL", args.db_url)
+    engine = create_engine(args.db_url)
+    if args.drop:
+        SQLModel.metadata.drop_all(engine)
+    SQLModel.metadata.create_all(engine)
+
+    start = time.perf_counter()
+    generate(engine, args.mentors, args.students, args.seed)
+    print(f"generated {args.mentors} mentors / {args.students} students in "
+          f"{time.perf_counter() - start:.1f}s ({args.db_url})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,238 @@
+"""Per-endpoint load test against the real app, with a regression gate.
+
+Seeds benchmarks.datagen data, then drives each scenario with --concurrency
+concurrent clients and reports p50/p95/p99 latency, throughput and DB
+queries per request (from the Server-Timing header). With --check, the run
+is compared to a stored baseline and the exit status is 1 on a regression:
+--gate latency (p50 by default; in-process tails are noisy) more than
+--tolerance above baseline and beyond a --min-delta-ms noise floor, more
+queries per request, or any failed request. Streamed responses only count
+the queries run before their headers go out.
+
+Usage (from backend/):
+    python -m benchmarks.load                      # in-process app, throwaway SQLite
+    python -m benchmarks.load --check              # fail on regression vs benchmarks/baseline.json
+    python -m benchmarks.load --update-baseline    # record a new baseline
+    python -m benchmarks.load --base-url http://127.0.0.1:8000 --db-url postgresql://...
+
+With --base-url the data is written to --db-url and requests go to a running
+server, which must use that database, the same SECRET_KEY and
+SERVER_TIMING=true for query counts. Latency baselines are machine-specific;
+record one on the machine that runs the check.
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import re
+import statistics
+import sys
+import tempfile
+import time
+from dataclasses import asdict, dataclass
+from typing import Callable, Dict, List, Optional, Tuple
+
+import httpx
+
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), "baseline.json")
+_QUERIES = re.compile(r'desc="(\d+) queries"')
+# Queries/request is an average; auth and profile cache hits move it by a
+# fraction between runs, an N+1 moves it by at least one.
+QUERY_SLACK = 0.5
+
+# name -> (method, path, auth); "{...}" parts are filled per request.
+SCENARIOS = {
+    "roster": ("GET", "/api/v1/mentor/students?limit=50", "mentor"),
+    "roster sparse": ("GET", "/api/v1/mentor/students?limit=50&fields=name,enrollment_no,photo_thumb,is_ban&include=", "mentor"),
+    "roster filtered": ("GET", "/api/v1/mentor/students?semester=sem3&has_active_kt=false&min_average_score=6", "mentor"),
+    "roster export csv": ("GET", "/api/v1/mentor/students/export", "mentor"),
+    "mentor stats": ("GET", "/api/v1/mentor/stats", "mentor"),
+    "search": ("GET", "/api/v1/mentor/search?q={query}", "mentor"),
+    "student me": ("GET", "/api/v1/student/me", "student"),
+    "profile by uuid": ("GET", "/api/v1/student/?uuid={personal_info_id}", None),
+    "mentor login": ("POST", "/api/v1/mentor/login", None),
+}
+
+
+@dataclass
+class Result:
+    requests: int
+    errors: int
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+    rps: float
+    queries: Optional[float]
+
+
+def percentile(samples: List[float], pct: float) -> float:
+    return samples[min(len(samples) - 1, max(0, round(pct / 100 * len(samples)) - 1))]
+
+
+class Workload:
+    """Builds per-request arguments from the generated dataset."""
+
+    def __init__(self, data, seed: int):
+        from benchmarks.datagen import MENTOR_PASSWORD
+        from security import create_token
+
+        self.data = data
+        self.rng = random.Random(seed)
+        self.mentor_tokens = [create_token(str(id)) for id in data.mentor_ids]
+        self.student_tokens = [create_token(str(id)) for id in data.personal_info_ids]
+        self.password = MENTOR_PASSWORD
+
+    def request(self, scenario: str) -> Tuple[str, str, dict]:
+        method, path, auth = SCENARIOS[scenario]
+        path = path.format(
+            query=self.rng.choice(self.data.names).split()[0][:5].lower(),
+            personal_info_id=self.rng.choice(self.data.personal_info_ids),
+        )
+        kwargs = {}
+        if auth:
+            tokens = self.mentor_tokens if auth == "mentor" else self.student_tokens
+            kwargs["headers"] = {"Authorization": f"Bearer {self.rng.choice(tokens)}"}
+        if scenario == "mentor login":
+            kwargs["json"] = {"email": self.rng.choice(self.data.mentor_emails), "password": self.password}
+        return method, path, kwargs
+
+
+async def run_scenario(client: httpx.AsyncClient, request: Callable, total: int, concurrency: int) -> Result:
+    latencies, queries = [], []
+    errors = 0
+    remaining = iter(range(total))
+
+    async def worker():
+        nonlocal errors
+        for _ in remaining:
+            method, path, kwargs = request()
+            start = time.perf_counter()
+            response = await client.request(method, path, **kwargs)
+            latencies.append((time.perf_counter() - start) * 1000)
+            if response.status_code >= 400:
+                errors += 1
+            match = _QUERIES.search(response.headers.get("server-timing", ""))
+            if match:
+                queries.append(int(match.group(1)))
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+    latencies.sort()
+    return Result(
+        requests=total, errors=errors,
+        p50_ms=round(percentile(latencies, 50), 2),
+        p95_ms=round(percentile(latencies, 95), 2),
+        p99_ms=round(percentile(latencies, 99), 2),
+        rps=round(total / elapsed, 1),
+        queries=round(statistics.mean(queries), 2) if queries else None,
+    )
+
+
+def compare(results: Dict[str, Result], baseline: dict, gate: str, tolerance: float, min_delta_ms: float) -> List[str]:
+    failures = []
+    for name, result in results.items():
+        if result.errors:
+            failures.append(f"{name}: {result.errors}/{result.requests} requests failed")
+        base = baseline["endpoints"].get(name)
+        if base is None:
+            continue
+        value, limit = getattr(result, gate), max(base[gate] * (1 + tolerance), base[gate] + min_delta_ms)
+        if value > limit:
+            failures.append(f"{name}: {gate} {value} > {limit:.2f} (baseline {base[gate]})")
+        if result.queries is not None and base.get("queries") is not None and result.queries > base["queries"] + QUERY_SLACK:
+            failures.append(f"{name}: {result.queries} queries/request > baseline {base['queries']}")
+    return failures
+
+
+async def run(args, data) -> Dict[str, Result]:
+    if args.base_url:
+        transport, base_url = None, args.base_url
+    else:
+        from app import app
+        transport, base_url = httpx.ASGITransport(app=app), "http://bench"
+
+    workload = Workload(data, args.seed)
+    scenarios = args.scenario or list(SCENARIOS)
+    results = {}
+    async with httpx.AsyncClient(transport=transport, base_url=base_url, timeout=60) as client:
+        for name in scenarios:
+            requests = max(1, args.requests // 10) if name == "mentor login" else args.requests
+            await run_scenario(client, lambda: workload.request(name), args.warmup, args.concurrency)
+            results[name] = await run_scenario(client, lambda: workload.request(name), requests, args.concurrency)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--mentors", type=int, default=40)
+    parser.add_argument("--students", type=int, default=2000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--requests", type=int, default=200, help="per scenario (mentor login runs a tenth)")
+    parser.add_argument("--warmup", type=int, default=10)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--scenario", action="append", choices=list(SCENARIOS))
+    parser.add_argument("--db-url")
+    parser.add_argument("--base-url")
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--check", action="store_true")
+    parser.add_argument("--update-baseline", action="store_true")
+    parser.add_argument("--gate", choices=["p50_ms", "p95_ms", "p99_ms"], default="p50_ms")
+    parser.add_argument("--tolerance", type=float, default=0.5, help="allowed latency growth, fraction")
+    parser.add_argument("--min-delta-ms", type=float, default=2.0)
+    args = parser.parse_args()
+    if args.base_url and not args.db_url:
+        parser.error("--base-url needs --db-url, the database the server uses")
+
+    # The app reads these at import time, so set them before importing it.
+    db_url = args.db_url or f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'load.db')}"
+    os.environ["DB_URL"] = db_url
+    os.environ.setdefault("SERVER_TIMING", "true")
+    os.environ.setdefault("SLOW_QUERY_MS", "5000")  # SQLite under load would flood the log
+    os.environ.setdefault("SECRET_KEY", "benchmark")
+    os.environ.setdefault("ALGORITHM", "HS256")
+    os.environ.setdefault("GOOGLE_CLIENT_ID", "benchmark")
+    os.environ.setdefault("GOOGLE_CLIENT_SECRET", "benchmark")
+
+    from sqlmodel import SQLModel
+
+    import database
+    from benchmarks.datagen import generate
+
+    SQLModel.metadata.drop_all(database.engine)
+    SQLModel.metadata.create_all(database.engine)
+    start = time.perf_counter()
+    data = generate(database.engine, args.mentors, args.students, args.seed)
+    print(f"seeded {args.mentors} mentors / {args.students} students in {time.perf_counter() - start:.1f}s ({db_url})")
+
+    results = asyncio.run(run(args, data))
+
+    print(f"\n{'endpoint':20} {'reqs':>6} {'err':>4} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'req/s':>8} {'queries':>8}")
+    for name, r in results.items():
+        queries = "-" if r.queries is None else f"{r.queries:g}"
+        print(f"{name:20} {r.requests:6} {r.errors:4} {r.p50_ms:9.2f} {r.p95_ms:9.2f} {r.p99_ms:9.2f} {r.rps:8.1f} {queries:>8}")
+
+    config = {k: getattr(args, k) for k in ("mentors", "students", "seed", "requests", "concurrency")}
+    config["database"] = database.engine.dialect.name
+    if args.update_baseline:
+        with open(args.baseline, "w") as f:
+            json.dump({"config": config, "endpoints": {n: asdict(r) for n, r in results.items()}}, f, indent=2)
+            f.write("\n")
+        print(f"\nbaseline written to {args.baseline}")
+
+    if args.check:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        if baseline["config"] != config:
+            print(f"\nwarning: baseline recorded with {baseline['config']}, this run used {config}")
+        failures = compare(results, baseline, args.gate, args.tolerance, args.min_delta_ms)
+        for failure in failures:
+            print(f"REGRESSION {failure}")
+        if failures:
+            sys.exit(1)
+        print(f"\nno regressions against {args.baseline}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+"""Lookup latency for the hot auth/roster queries, with and without indexes.
+
+Usage (from backend/):
+    python -m benchmarks.lookup_indexes --students 50000
+    python -m benchmarks.lookup_indexes --students 50000 --no-indexes
+    python -m benchmarks.lookup_indexes --db-url postgresql://... --students 50000
+
+Without --db-url a throwaway SQLite file is used.
+"""
+import argparse
+import os
+import random
+import statistics
+import tempfile
+import time
+import uuid
+
+from sqlalchemy import create_engine, insert, or_, text
+from sqlmodel import Session, SQLModel, select
+
+from models import Mark, Mentor, PersonalInfo, Student
+from models.mark import Sem
+
+STUDENTS_PER_MENTOR = 25
+
+
+def seed(engine, students: int):
+    mentor_ids = [uuid.uuid4() for _ in range(max(1, students // STUDENTS_PER_MENTOR))]
+    student_ids = [uuid.uuid4() for _ in range(students)]
+    with Session(engine) as session:
+        session.execute(insert(Mentor), [
+            {"id": m, "email": f"mentor{i}@atharva.edu", "password": "x",
+             "semester": "sem3", "mentor_name": f"Mentor {i}"}
+            for i, m in enumerate(mentor_ids)
+        ])
+        session.execute(insert(Student), [
+            {"id": s, "mentor_id": mentor_ids[i % len(mentor_ids)]}
+            for i, s in enumerate(student_ids)
+        ])
+        session.execute(insert(PersonalInfo), [
+            {"id": uuid.uuid4(), "name": f"Student {i}", "atharva_email": f"s{i}@atharva.edu",
+             "enrollment_no": f"EN{i:06}", "student_id": s}
+            for i, s in enumerate(student_ids)
+        ])
+        session.execute(insert(Mark), [
+            {"id": uuid.uuid4(), "semester": sem, "marks": "8.0", "no_of_kt": "0",
+             "kt_subject": "", "student_id": s}
+            for s in student_ids for sem in (Sem.sem1, Sem.sem2)
+        ])
+        session.commit()
+    return mentor_ids
+
+
+def drop_indexes(engine):
+    with engine.begin() as conn:
+        for table in SQLModel.metadata.sorted_tables:
+            for index in table.indexes:
+                index.drop(conn)
+
+
+def timed(session, statement, runs: int):
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        session.exec(statement()).all()
+        samples.append((time.perf_counter() - start) * 1000)
+    samples.sort()
+    return statistics.median(samples), samples[int(len(samples) * 0.95) - 1]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--students", type=int, default=50_000)
+    parser.add_argument("--runs", type=int, default=200)
+    parser.add_argument("--db-url")
+    parser.add_argument("--no-indexes", action="store_true")
+    args = parser.parse_args()
+
+    db_url = args.db_url or f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'bench.db')}"
+    engine = create_engine(db_url)
+    SQLModel.metadata.drop_all(engine)
+    SQLModel.metadata.create_all(engine)
+    if args.no_indexes:
+        drop_indexes(engine)
+
+    start = time.perf_counter()
+    mentor_ids = seed(engine, args.students)
+    print(f"seeded {args.students} students in {time.perf_counter() - start:.1f}s ({db_url})")
+    with engine.begin() as conn:
+        conn.execute(text("ANALYZE"))
+
+    rand = random.Random(0)
+    cases = {
+        "student by atharva_email": lambda: select(PersonalInfo).where(
+            PersonalInfo.atharva_email == f"s{rand.randrange(args.students)}@atharva.edu"),
+        "mentor by email": lambda: select(Mentor).where(
+            Mentor.email == f"mentor{rand.randrange(len(mentor_ids))}@atharva.edu"),
+        "roster by mentor_id": lambda: select(Student).where(
+            Student.mentor_id == rand.choice(mentor_ids)),
+        "marks by student_id+semester": lambda: select(Mark).join(Student).where(
+            Student.mentor_id == rand.choice(mentor_ids), Mark.semester == Sem.sem2),
+        "name/enrollment ILIKE": lambda: select(PersonalInfo).where(or_(
+            PersonalInfo.name.ilike(f"%{rand.randrange(args.students)}%"),
+            PersonalInfo.enrollment_no.ilike(f"%{rand.randrange(args.students)}%"))).limit(50),
+    }
+
+    print(f"{'query':32} {'p50 ms':>9} {'p95 ms':>9}")
+    with Session(engine) as session:
+        for name, statement in cases.items():
+            p50, p95 = timed(session, statement, args.runs)
+            print(f"{name:32} {p50:9.3f} {p95:9.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""Roster serialization cost and bytes on the wire.
+
+Compares FastAPI's default path for ``response_model=List[StudentProfileResponse]``
+(re-validate, encode to JSON-able data, stdlib json) with returning the
+already-built models in FastJSONResponse, then sizes the body with each
+Content-Encoding CompressionMiddleware can negotiate.
+
+Usage (from backend/):
+    python -m benchmarks.serialization --students 500
+"""
+import argparse
+import asyncio
+import statistics
+import time
+import uuid
+import zlib
+from typing import List
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_model_field
+
+from models.mark import Sem
+from schema.profile import StudentProfileResponse
+from utils import compression
+from utils.responses import FastJSONResponse
+
+PERSONAL_TEXT = [
+    "date_of_birth", "blood_group", "aadhar_no", "personal_email", "mobile_no",
+    "father_name", "father_occupation", "father_mobile", "mother_name",
+    "mother_occupation", "mother_mobile", "local_address", "permanent_address",
+    "ssc", "hsc", "diploma", "sport", "other", "department",
+]
+
+
+def roster(students: int) -> List[StudentProfileResponse]:
+    return [
+        StudentProfileResponse.model_validate({
+            "personal_info": {
+                "id": uuid.uuid4(), "name": f"Student {i}", "enrollment_no": f"EN{i:06}",
+                "photo": f"https://res.cloudinary.com/demo/image/upload/students/{i}.webp",
+                **{field: f"{field.replace('_', ' ')} of student {i}" for field in PERSONAL_TEXT},
+                "nss_member": i % 3 == 0, "ember_member": i % 5 == 0, "rhythm_member": False,
+            },
+            "achievements": {"first_year": "Hackathon finalist", "second_year": "", "third_year": "", "final_year": ""},
+            "marks": [
+                {"semester": sem, "marks": f"{6 + (i + n) % 4}.{n}", "no_of_kt": str((i + n) % 2), "kt_subject": "Maths" if (i + n) % 2 else ""}
+                for n, sem in enumerate(list(Sem)[:6])
+            ],
+            "counseling": [
+                {"sr_no": n, "topic": "Attendance", "date": "2026-08-01", "action_taken": "Talked to parents",
+                 "remark": "Improving", "sign": "Mentor"}
+                for n in range(1, 3)
+            ],
+        })
+        for i in range(students)
+    ]
+
+
+def timed(fn, runs: int):
+    fn()
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        result = fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    samples.sort()
+    return result, statistics.median(samples), samples[int(len(samples) * 0.95) - 1]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--students", type=int, default=500)
+    parser.add_argument("--runs", type=int, default=30)
+    args = parser.parse_args()
+
+    profiles = roster(args.students)
+    field = create_model_field("Response", List[StudentProfileResponse], mode="serialization")
+    loop = asyncio.new_event_loop()
+
+    def fastapi_default():
+        content = loop.run_until_complete(serialize_response(field=field, response_content=profiles))
+        return JSONResponse(content).body
+
+    cases = {
+        "response_model + JSONResponse": fastapi_default,
+        "FastJSONResponse(models)": lambda: FastJSONResponse(profiles).body,
+    }
+    print(f"{args.students} profiles")
+    print(f"{'serializer':32} {'p50 ms':>9} {'p95 ms':>9} {'bytes':>10}")
+    for name, fn in cases.items():
+        body, p50, p95 = timed(fn, args.runs)
+        print(f"{name:32} {p50:9.2f} {p95:9.2f} {len(body):10}")
+
+    encoders = {"identity": lambda data: data}
+    encoders[f"gzip (level {compression.GZIP_LEVEL})"] = lambda data: compression._Gzip().finish(data)
+    encoders["gzip (level 1)"] = lambda data: zlib.compress(data, 1)
+    if compression.brotli is not None:
+        encoders[f"br (quality {compression.BROTLI_QUALITY})"] = lambda data: compression._Brotli().finish(data)
+    else:
+        print("\nbrotli not installed; br skipped")
+
+    print(f"\n{'content-encoding':32} {'p50 ms':>9} {'p95 ms':>9} {'bytes':>10}")
+    for name, encode in encoders.items():
+        wire, p50, p95 = timed(lambda: encode(body), args.runs)
+        print(f"{name:32} {p50:9.2f} {p95:9.2f} {len(wire):10}")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,9 +2,14 @@ import os
 from typing import Annotated
 from dotenv import load_dotenv
 from fastapi import Depends
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import create_async_engine
 from sqlalchemy.sql import true
 from sqlmodel import Session, create_engine, SQLModel
+from sqlmodel.ext.asyncio.session import AsyncSession
 from models import *
+from utils.metrics import TimedAsyncQueuePool, TimedQueuePool, register_pool
+from utils.query_stats import instrument
 
 load_dotenv()
 
@@ -13,14 +18,64 @@ DB_URL = os.getenv("DB_URL")
 if not DB_URL:
     raise ValueError("DB_URL not set in the environment variables")
 
-engine = create_engine(DB_URL,echo=True)
+DB_ECHO = os.getenv("DB_ECHO", "false").lower() == "true"
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", 5))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", 10))
+DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "true").lower() == "true"
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", 1800))
+
+ASYNC_DRIVERS = {
+    "postgresql": "postgresql+asyncpg",
+    "sqlite": "sqlite+aiosqlite",
+}
+
+
+def _async_url(url: str) -> str:
+    parsed = make_url(url)
+    backend = parsed.get_backend_name()
+    if backend not in ASYNC_DRIVERS:
+        raise ValueError(f"No async driver configured for '{backend}'; set ASYNC_DB_URL")
+    return parsed.set(drivername=ASYNC_DRIVERS[backend]).render_as_string(hide_password=False)
+
+
+def _pool_options(url: str, poolclass, name: str) -> dict:
+    options = {"pool_pre_ping": DB_POOL_PRE_PING, "pool_recycle": DB_POOL_RECYCLE}
+    # SQLite uses single-connection/static pools that don't accept sizing.
+    if make_url(url).get_backend_name() != "sqlite":
+        # Same queue pools SQLAlchemy would pick, timing each checkout.
+        options.update(
+            pool_size=DB_POOL_SIZE, max_overflow=DB_MAX_OVERFLOW,
+            poolclass=poolclass, pool_logging_name=name,
+        )
+    return options
+
+
+ASYNC_DB_URL = os.getenv("ASYNC_DB_URL") or _async_url(DB_URL)
+
+engine = create_engine(DB_URL, echo=DB_ECHO, **_pool_options(DB_URL, TimedQueuePool, "sync"))
+async_engine = create_async_engine(
+    ASYNC_DB_URL, echo=DB_ECHO, **_pool_options(ASYNC_DB_URL, TimedAsyncQueuePool, "async")
+)
+
+instrument(engine)
+instrument(async_engine.sync_engine)
+register_pool("sync", engine)
+register_pool("async", async_engine.sync_engine)
 
 def create_db_and_tables():
-    SQLModel.metadata.create_all(engine)  
+    SQLModel.metadata.create_all(engine)
 
 def get_session():
     with Session(engine) as session:
         yield session
 
 
+async def get_async_session():
+    # expire_on_commit=False: reloading expired attributes would be implicit IO,
+    # which AsyncSession can't do on attribute access.
+    async with AsyncSession(async_engine, expire_on_commit=False) as session:
+        yield session
+
+
 SessionDep = Annotated[Session, Depends(get_session)]
+AsyncSessionDep = Annotated[AsyncSession, Depends(get_async_session)]
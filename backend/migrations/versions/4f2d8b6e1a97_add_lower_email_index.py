@@ -0,0 +1,26 @@
+"""add lower(atharva_email) index for case-insensitive lookups
+
+Revision ID: 4f2d8b6e1a97
+Revises: 9c4e1b7a2d35
+Create Date: 2026-10-18 18:40:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4f2d8b6e1a97'
+down_revision: Union[str, None] = '9c4e1b7a2d35'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_personalinfo_atharva_email_lower', 'personalinfo', [sa.text('lower(atharva_email)')])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_personalinfo_atharva_email_lower', table_name='personalinfo')
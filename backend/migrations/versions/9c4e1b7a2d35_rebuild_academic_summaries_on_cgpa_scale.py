@@ -0,0 +1,31 @@
+"""rebuild academic summaries on the CGPA scale
+
+Revision ID: 9c4e1b7a2d35
+Revises: f3b8d2e6a914
+Create Date: 2026-10-18 18:20:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+from sqlmodel import Session
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9c4e1b7a2d35'
+down_revision: Union[str, None] = 'f3b8d2e6a914'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Summaries written before services.academic_summary.parse_score mixed
+    # percentages and CGPAs in the same averages; recompute them all. The
+    # session joins the migration's transaction.
+    from services.academic_summary import backfill
+
+    backfill(Session(bind=op.get_bind()))
+
+
+def downgrade() -> None:
+    pass
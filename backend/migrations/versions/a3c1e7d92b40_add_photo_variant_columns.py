@@ -0,0 +1,29 @@
+"""add photo variant columns to PersonalInfo
+
+Revision ID: a3c1e7d92b40
+Revises: 6e33d4d5680a
+Create Date: 2026-10-18 13:10:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a3c1e7d92b40'
+down_revision: Union[str, None] = '6e33d4d5680a'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('personalinfo', sa.Column('photo_medium', sqlmodel.sql.sqltypes.AutoString(), nullable=True))
+    op.add_column('personalinfo', sa.Column('photo_thumb', sqlmodel.sql.sqltypes.AutoString(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('personalinfo', 'photo_thumb')
+    op.drop_column('personalinfo', 'photo_medium')
@@ -0,0 +1,27 @@
+"""add version column to PersonalInfo
+
+Revision ID: b7d4f2a6c913
+Revises: a3c1e7d92b40
+Create Date: 2026-10-18 13:20:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7d4f2a6c913'
+down_revision: Union[str, None] = 'a3c1e7d92b40'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('personalinfo', sa.Column('version', sa.Integer(), server_default='1', nullable=False))
+
+
+def downgrade() -> None:
+    op.drop_column('personalinfo', 'version')
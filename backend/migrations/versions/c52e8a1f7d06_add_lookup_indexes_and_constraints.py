@@ -0,0 +1,77 @@
+"""add lookup indexes and unique email constraints
+
+Revision ID: c52e8a1f7d06
+Revises: b7d4f2a6c913
+Create Date: 2026-10-18 13:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c52e8a1f7d06'
+down_revision: Union[str, None] = 'b7d4f2a6c913'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Trigram GIN indexes let ILIKE '%term%' on the mentor search columns use an
+# index instead of a sequential scan.
+TRGM_COLUMNS = ['name', 'enrollment_no', 'atharva_email']
+# The baseline never enforced these; duplicates must go before the indexes.
+UNIQUE_COLUMNS = [('personalinfo', 'atharva_email'), ('mentor', 'email')]
+
+
+def _check_duplicates() -> None:
+    """Stop before any DDL, naming the duplicates, rather than fail partway
+    through at CREATE UNIQUE INDEX. Which duplicate profile or mentor to keep
+    is a data decision, so nothing is merged or deleted here."""
+    problems = []
+    for table, column in UNIQUE_COLUMNS:
+        rows = op.get_bind().execute(sa.text(
+            f'SELECT {column}, COUNT(*) FROM {table} '
+            f'GROUP BY {column} HAVING COUNT(*) > 1 ORDER BY {column} LIMIT 20'
+        )).all()
+        if rows:
+            problems.append(f'{table}.{column}: ' + ', '.join(f'{value} ({count} rows)' for value, count in rows))
+    if problems:
+        raise RuntimeError(
+            'Cannot add unique indexes; remove or merge these duplicate rows first '
+            '(nothing was changed):\n  ' + '\n  '.join(problems)
+        )
+
+
+def upgrade() -> None:
+    _check_duplicates()
+    op.create_index('ix_personalinfo_atharva_email', 'personalinfo', ['atharva_email'], unique=True)
+    op.create_index('ix_personalinfo_student_id', 'personalinfo', ['student_id'])
+    op.create_index('ix_mentor_email', 'mentor', ['email'], unique=True)
+    op.create_index('ix_student_mentor_id', 'student', ['mentor_id'])
+    op.create_index('ix_achievement_student_id', 'achievement', ['student_id'])
+    op.create_index('ix_counseling_student_id', 'counseling', ['student_id'])
+    op.create_index('ix_mark_student_id_semester', 'mark', ['student_id', 'semester'])
+
+    if op.get_bind().dialect.name == 'postgresql':
+        op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+        for column in TRGM_COLUMNS:
+            op.execute(
+                f'CREATE INDEX ix_personalinfo_{column}_trgm '
+                f'ON personalinfo USING gin ({column} gin_trgm_ops)'
+            )
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name == 'postgresql':
+        for column in TRGM_COLUMNS:
+            op.execute(f'DROP INDEX IF EXISTS ix_personalinfo_{column}_trgm')
+
+    op.drop_index('ix_mark_student_id_semester', table_name='mark')
+    op.drop_index('ix_counseling_student_id', table_name='counseling')
+    op.drop_index('ix_achievement_student_id', table_name='achievement')
+    op.drop_index('ix_student_mentor_id', table_name='student')
+    op.drop_index('ix_mentor_email', table_name='mentor')
+    op.drop_index('ix_personalinfo_student_id', table_name='personalinfo')
+    op.drop_index('ix_personalinfo_atharva_email', table_name='personalinfo')
@@ -0,0 +1,42 @@
+"""add search_text to PersonalInfo with trigram and full-text indexes
+
+Revision ID: d19b3e7a4c58
+Revises: c52e8a1f7d06
+Create Date: 2026-10-18 13:40:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd19b3e7a4c58'
+down_revision: Union[str, None] = 'c52e8a1f7d06'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('personalinfo', sa.Column('search_text', sqlmodel.sql.sqltypes.AutoString(), nullable=True))
+
+    if op.get_bind().dialect.name == 'postgresql':
+        # Same composition as services.search.build_search_text.
+        op.execute("""
+            UPDATE personalinfo p SET search_text = lower(concat_ws(' ',
+                p.name, p.enrollment_no, p.atharva_email, p.sport,
+                (SELECT string_agg(NULLIF(m.kt_subject, ''), ' ') FROM mark m WHERE m.student_id = p.student_id)
+            ))
+        """)
+        op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+        op.execute('CREATE INDEX ix_personalinfo_search_text_trgm ON personalinfo USING gin (search_text gin_trgm_ops)')
+        op.execute("CREATE INDEX ix_personalinfo_search_text_fts ON personalinfo USING gin (to_tsvector('simple', search_text))")
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name == 'postgresql':
+        op.execute('DROP INDEX IF EXISTS ix_personalinfo_search_text_fts')
+        op.execute('DROP INDEX IF EXISTS ix_personalinfo_search_text_trgm')
+    op.drop_column('personalinfo', 'search_text')
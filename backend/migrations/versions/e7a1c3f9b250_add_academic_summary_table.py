@@ -0,0 +1,46 @@
+"""add academicsummary table
+
+Revision ID: e7a1c3f9b250
+Revises: d19b3e7a4c58
+Create Date: 2026-10-18 15:10:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e7a1c3f9b250'
+down_revision: Union[str, None] = 'd19b3e7a4c58'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+INDEXED = ['latest_semester', 'latest_score', 'average_score', 'total_kts', 'active_kts', 'trend']
+
+
+def upgrade() -> None:
+    op.create_table(
+        'academicsummary',
+        sa.Column('student_id', sa.Uuid(), nullable=False),
+        sa.Column('semesters_recorded', sa.Integer(), nullable=False),
+        sa.Column('latest_semester', sa.Integer(), nullable=True),
+        sa.Column('latest_score', sa.Float(), nullable=True),
+        sa.Column('average_score', sa.Float(), nullable=True),
+        sa.Column('total_kts', sa.Integer(), nullable=False),
+        sa.Column('active_kts', sa.Integer(), nullable=False),
+        sa.Column('score_delta', sa.Float(), nullable=True),
+        sa.Column('trend', sa.Integer(), nullable=True),
+        sa.ForeignKeyConstraint(['student_id'], ['student.id'], ),
+        sa.PrimaryKeyConstraint('student_id'),
+    )
+    for column in INDEXED:
+        op.create_index(op.f(f'ix_academicsummary_{column}'), 'academicsummary', [column], unique=False)
+    # Populate with: python -m services.academic_summary
+
+
+def downgrade() -> None:
+    for column in INDEXED:
+        op.drop_index(op.f(f'ix_academicsummary_{column}'), table_name='academicsummary')
+    op.drop_table('academicsummary')
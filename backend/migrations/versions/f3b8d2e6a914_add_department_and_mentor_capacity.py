@@ -0,0 +1,31 @@
+"""add department to mentor and personalinfo, and mentor capacity
+
+Revision ID: f3b8d2e6a914
+Revises: e7a1c3f9b250
+Create Date: 2026-10-18 15:40:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f3b8d2e6a914'
+down_revision: Union[str, None] = 'e7a1c3f9b250'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('mentor', sa.Column('department', sqlmodel.sql.sqltypes.AutoString(), nullable=True))
+    op.add_column('mentor', sa.Column('capacity', sa.Integer(), nullable=True))
+    op.add_column('personalinfo', sa.Column('department', sqlmodel.sql.sqltypes.AutoString(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('personalinfo', 'department')
+    op.drop_column('mentor', 'capacity')
+    op.drop_column('mentor', 'department')
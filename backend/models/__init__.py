@@ -4,9 +4,11 @@ from .mark import Mark
 from .achievement import Achievement
 from .mentor import Mentor
 from .counseling import Counseling
+from .academic_summary import AcademicSummary
 
 __all__ = [
-    "Student", "PersonalInfo", "Mark", "Achievement", "Mentor", "Counseling"
+    "Student", "PersonalInfo", "Mark", "Achievement", "Mentor", "Counseling",
+    "AcademicSummary"
 ]
 
 for model_name in __all__:
@@ -0,0 +1,17 @@
+from typing import Optional
+from sqlmodel import SQLModel, Field
+import uuid
+
+class AcademicSummary(SQLModel, table=True):
+    """Numeric digest of a student's free-form Mark rows, maintained by
+    services.academic_summary whenever marks are written."""
+    student_id: uuid.UUID = Field(foreign_key="student.id", primary_key=True)
+    semesters_recorded: int = 0
+    latest_semester: Optional[int] = Field(default=None, index=True)
+    latest_score: Optional[float] = Field(default=None, index=True)
+    average_score: Optional[float] = Field(default=None, index=True)
+    total_kts: int = Field(default=0, index=True)
+    active_kts: int = Field(default=0, index=True)
+    # latest_score minus the previous recorded semester's score
+    score_delta: Optional[float] = None
+    trend: Optional[int] = Field(default=None, index=True)  # 1 up, 0 flat, -1 down
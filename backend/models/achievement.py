@@ -11,5 +11,5 @@ class Achievement(SQLModel, table=True):
     second_year: str
     third_year: str
     final_year: str
-    student_id: Optional[uuid.UUID] = Field(default=None, foreign_key="student.id")
+    student_id: Optional[uuid.UUID] = Field(default=None, foreign_key="student.id", index=True)
     student: Optional["Student"] = Relationship(back_populates="achievements") 
\ No newline at end of file
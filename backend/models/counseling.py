@@ -13,5 +13,5 @@ class Counseling(SQLModel, table=True):
     action_taken: str
     remark: str
     sign: str
-    student_id: Optional[uuid.UUID] = Field(default=None, foreign_key="student.id")
+    student_id: Optional[uuid.UUID] = Field(default=None, foreign_key="student.id", index=True)
     student: Optional["Student"] = Relationship(back_populates="counseling") 
\ No newline at end of file
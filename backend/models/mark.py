@@ -1,4 +1,5 @@
 from typing import Optional, TYPE_CHECKING
+from sqlalchemy import Index
 from sqlmodel import SQLModel, Field, Relationship
 import uuid
 from enum import Enum
@@ -16,6 +17,9 @@ class Sem(str, Enum):
     sem8 = "sem8"
     
 class Mark(SQLModel, table=True):
+    # Covers both per-student loads and the semester EXISTS filter.
+    __table_args__ = (Index("ix_mark_student_id_semester", "student_id", "semester"),)
+
     id: Optional[uuid.UUID] = Field(default_factory=uuid.uuid4, primary_key=True)
     semester: Optional[Sem] = Field(default=None)
     marks: str
@@ -8,8 +8,11 @@ if TYPE_CHECKING:
 
 class Mentor(SQLModel, table=True):
     id: Optional[uuid.UUID] = Field(default_factory=uuid.uuid4, primary_key=True)
-    email: str
+    email: str = Field(index=True, unique=True)
     password: str
     semester: str
     mentor_name: str
+    department: Optional[str] = None
+    # Most students the assignment service may give this mentor; None = no limit.
+    capacity: Optional[int] = None
     students: List["Student"] = Relationship(back_populates="mentor")
\ No newline at end of file
@@ -1,4 +1,5 @@
 from typing import Optional, TYPE_CHECKING
+from sqlalchemy import Index, func
 from sqlmodel import SQLModel, Field, Relationship
 import uuid
 
@@ -8,7 +9,7 @@ if TYPE_CHECKING:
 class PersonalInfo(SQLModel, table=True):
     id: Optional[uuid.UUID] = Field(default_factory=uuid.uuid4, primary_key=True)
     name: str
-    atharva_email: str  # required, from Google OAuth
+    atharva_email: str = Field(index=True, unique=True)  # required, from Google OAuth
 
     enrollment_no: Optional[str] = None
     date_of_birth: Optional[str] = None
@@ -29,11 +30,22 @@ class PersonalInfo(SQLModel, table=True):
     diploma: Optional[str] = None
     sport: Optional[str] = None
     other: Optional[str] = None
+    department: Optional[str] = None
     photo: Optional[str] = None
+    photo_medium: Optional[str] = None
+    photo_thumb: Optional[str] = None
     is_ban : Optional[bool] = False
     nss_member: bool = False
     ember_member: bool = False
     rhythm_member: bool = False
+    # Bumped on every profile write; drives profile cache keys and ETags.
+    version: int = Field(default=1, sa_column_kwargs={"server_default": "1"})
+    # Lowercased name/enrollment/email/sport/KT subjects, see services.search.
+    search_text: Optional[str] = None
 
-    student_id: Optional[uuid.UUID] = Field(default=None, foreign_key="student.id")
+    student_id: Optional[uuid.UUID] = Field(default=None, foreign_key="student.id", index=True)
     student: Optional["Student"] = Relationship(back_populates="personal_info")
+
+
+# Case-insensitive email lookups (services.importer).
+Index("ix_personalinfo_atharva_email_lower", func.lower(PersonalInfo.atharva_email))
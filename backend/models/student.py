@@ -8,7 +8,7 @@ if TYPE_CHECKING:
 class Student(SQLModel, table=True):
     id: Optional[uuid.UUID] = Field(default_factory=uuid.uuid4, primary_key=True)
     personal_info: Optional["PersonalInfo"] = Relationship(back_populates="student")
-    mentor_id: Optional[uuid.UUID] = Field(default=None, foreign_key="mentor.id")
+    mentor_id: Optional[uuid.UUID] = Field(default=None, foreign_key="mentor.id", index=True)
     mentor: Optional["Mentor"] = Relationship(back_populates="students")
     marks: List["Mark"] = Relationship(back_populates="student")
     achievements: Optional["Achievement"] = Relationship(back_populates="student")
@@ -0,0 +1,92 @@
+from typing import List, Literal, Optional
+from fastapi import APIRouter, status, Query, File, UploadFile
+from fastapi.concurrency import run_in_threadpool
+from fastapi.exceptions import HTTPException
+from fastapi.responses import PlainTextResponse
+from sqlmodel import Session
+from database import engine
+from schema.assignment import AssignmentReport
+from schema.imports import ImportReport
+from schema.profiling import ProfileSummary
+from security import AdminDep, invalidate_principal
+from services.assignment import assign, ASSIGN_DEFAULT_CAPACITY
+from services.importer import import_rows, read_rows, IMPORT_CHUNK_SIZE
+from services.mentor_stats import stats_cache
+from services.search import search_backend
+from utils import profiling
+
+router = APIRouter(prefix="/api/v1/admin", tags=["admin"])
+
+
+def _run_assign(dry_run: bool, default_capacity):
+    with Session(engine) as session:
+        return assign(session, dry_run, default_capacity)
+
+
+def _run_import(file, filename: str, chunk_size: int):
+    with Session(engine) as session:
+        return import_rows(session, read_rows(file, filename), chunk_size)
+
+
+@router.post("/import", response_model=ImportReport)
+async def import_students(
+    admin: AdminDep,
+    file: UploadFile = File(..., description="CSV or XLSX, one row per student"),
+    chunk_size: int = Query(IMPORT_CHUNK_SIZE, ge=1, le=5000, description="Rows per transaction"),
+):
+    filename = file.filename or ""
+    if not filename.lower().endswith((".csv", ".xlsx")):
+        raise HTTPException(
+            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            detail="Upload a .csv or .xlsx file"
+        )
+
+    # Parsing and bulk writes are blocking; keep them off the event loop.
+    result = await run_in_threadpool(_run_import, file.file, filename, chunk_size)
+
+    for personal_info_id, search_text in result.changed:
+        invalidate_principal("student", personal_info_id)
+        search_backend.document_changed(personal_info_id, search_text)
+    if result.changed:
+        # Rows can move students between mentors and touch any roster.
+        stats_cache.clear()
+    return result.report
+
+
+@router.post("/assign", response_model=AssignmentReport)
+async def assign_students(
+    admin: AdminDep,
+    dry_run: bool = Query(True, description="Only report the plan"),
+    default_capacity: Optional[int] = Query(ASSIGN_DEFAULT_CAPACITY, ge=1, description="Capacity for mentors without one"),
+):
+    """Distribute unassigned students across mentors; see services.assignment."""
+    assignment = await run_in_threadpool(_run_assign, dry_run, default_capacity)
+    if not dry_run:
+        for mentor in assignment.mentors:
+            if mentor.students:
+                stats_cache.delete(mentor.id)
+    return assignment.report(dry_run)
+
+
+@router.get("/profiles", response_model=List[ProfileSummary])
+async def list_profiles(admin: AdminDep):
+    """Profiled requests still stored on this host, newest first; see utils.profiling."""
+    return await run_in_threadpool(profiling.summaries)
+
+
+@router.get("/profiles/{profile_id}")
+async def get_profile(
+    admin: AdminDep,
+    profile_id: str,
+    format: Literal["speedscope", "collapsed", "timeline"] = Query(
+        "speedscope", description="speedscope JSON, collapsed stacks for flamegraph.pl, or the SQL timeline"
+    ),
+):
+    profile = await run_in_threadpool(profiling.load, profile_id)
+    if profile is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Profile not found")
+    if format == "collapsed":
+        return PlainTextResponse(profiling.collapsed(profile))
+    if format == "timeline":
+        return {"duration_ms": profile["duration_ms"], "queries": profile["timeline"]}
+    return profiling.speedscope(profile)
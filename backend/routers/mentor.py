@@ -1,81 +1,367 @@
+import base64
+import json
+import os
+import uuid
+
 from fastapi import APIRouter, status, Query, Depends
 from fastapi.exceptions import HTTPException
+from fastapi.responses import FileResponse, StreamingResponse
 from schema.mentor import MentorLoginRequest, MentorLoginResponse
 from schema.profile import StudentProfileResponse
-from database import SessionDep
-from models import Mentor, PersonalInfo
+from schema.batch import BatchItemResult, StudentBatchRequest, StudentBatchResponse
+from schema.search import StudentSearchResult
+from schema.stats import MentorStats
+from database import AsyncSessionDep, async_engine
+from models import AcademicSummary, Mentor, PersonalInfo, Student, Mark
+from models.mark import Sem
+from sqlalchemy import and_, func, or_, tuple_, update
 from sqlmodel import select
-from security import verify_password, create_token, MentorDep
-from typing import List, Optional
+from sqlmodel.ext.asyncio.session import AsyncSession
+from security import verify_and_update_password, create_token, invalidate_principal, MentorDep, ADMIN_EMAILS
+from services.mentor_stats import mentor_stats, stats_cache
+from services.roster_export import export_row, csv_chunks, xlsx_file
+from services.search import search_backend
+from utils.projection import FULL, Projection, get_projection
+from utils.responses import FastJSONResponse
+from starlette.background import BackgroundTask
+from utils.profile_cache import invalidate_profile
+from typing import List, Literal, Optional
 
 router = APIRouter(prefix="/api/v1/mentor", tags=["mentor"])
 
+MAX_PAGE_SIZE = 500
+STREAM_BATCH_SIZE = 100
+
 
 @router.post("/login", response_model=MentorLoginResponse)
-def login_mentor(request: MentorLoginRequest, session: SessionDep):
-    mentor = session.exec(select(Mentor).where(Mentor.email == request.email)).first()
-    if not mentor or not verify_password(request.password, mentor.password):
+async def login_mentor(request: MentorLoginRequest, session: AsyncSessionDep):
+    mentor = (await session.exec(select(Mentor).where(Mentor.email == request.email))).first()
+    if not mentor:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid email or password")
+    valid, new_hash = await verify_and_update_password(request.password, mentor.password)
+    if not valid:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid email or password")
+    if new_hash:
+        mentor.password = new_hash
+        session.add(mentor)
+        await session.commit()
     return MentorLoginResponse(access_token=create_token(str(mentor.id)), token_type="Bearer")
 
 
+def _contains(column, value: str):
+    escaped = value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return column.ilike(f"%{escaped}%", escape="\\")
+
+
+def _roster_conditions(
+    mentor_id,
+    name: Optional[str] = None,
+    semester: Optional[str] = None,
+    is_ban: Optional[bool] = None,
+    has_active_kt: Optional[bool] = None,
+    min_average_score: Optional[float] = None,
+):
+    """WHERE clauses over Student outer-joined to PersonalInfo for the
+    roster filters; None if no student can match."""
+    conditions = [Student.mentor_id == mentor_id]
+
+    if name:
+        conditions.append(or_(
+            _contains(PersonalInfo.name, name),
+            _contains(PersonalInfo.enrollment_no, name),
+            _contains(PersonalInfo.atharva_email, name),
+        ))
+
+    if semester:
+        if semester not in Sem.__members__:
+            return None
+        conditions.append(
+            select(Mark.id)
+            .where(Mark.student_id == Student.id, Mark.semester == Sem(semester))
+            .exists()
+        )
+
+    if is_ban is not None:
+        conditions.append(PersonalInfo.is_ban == is_ban)
+
+    # Numeric filters read the precomputed academic summary, not Mark text.
+    if has_active_kt is not None:
+        active = (
+            select(AcademicSummary.student_id)
+            .where(AcademicSummary.student_id == Student.id, AcademicSummary.active_kts > 0)
+            .exists()
+        )
+        conditions.append(active if has_active_kt else ~active)
+
+    if min_average_score is not None:
+        conditions.append(
+            select(AcademicSummary.student_id)
+            .where(
+                AcademicSummary.student_id == Student.id,
+                AcademicSummary.average_score >= min_average_score,
+            )
+            .exists()
+        )
+
+    return conditions
+
+
+def _students_query(mentor_id, *filters, projection: Projection = FULL):
+    conditions = _roster_conditions(mentor_id, *filters)
+    if conditions is None:
+        return None
+    # One query for students + personal info, then one batched IN query per
+    # requested child relationship, regardless of how many students the
+    # mentor has. enrollment_no is always loaded for the page cursor.
+    return (
+        select(Student)
+        .outerjoin(PersonalInfo, PersonalInfo.student_id == Student.id)
+        .where(*conditions)
+        .options(*projection.student_options("enrollment_no"))
+    )
+
+
+def _sort_key():
+    return func.coalesce(PersonalInfo.enrollment_no, ""), Student.id
+
+
+def _encode_cursor(student: Student) -> str:
+    enrollment_no = student.personal_info.enrollment_no if student.personal_info else None
+    raw = json.dumps([enrollment_no or "", str(student.id)])
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def _decode_cursor(cursor: str):
+    try:
+        enrollment_no, student_id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        return enrollment_no, uuid.UUID(student_id)
+    except Exception:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+
+
+async def _stream_students(statement):
+    # Dependencies with yield are closed before a streaming body is sent, so
+    # the stream owns its session and reads through a server-side cursor.
+    if statement is None:
+        return
+    async with AsyncSession(async_engine) as session:
+        result = await session.stream_scalars(statement.execution_options(yield_per=STREAM_BATCH_SIZE))
+        async for student in result:
+            yield student
+
+
+async def _stream_profiles(statement, projection: Projection = FULL):
+    async for student in _stream_students(statement):
+        yield projection.build(student.personal_info, student).model_dump_json() + "\n"
+
+
+async def _export_rows(statement, mentor_email: str):
+    async for student in _stream_students(statement):
+        yield export_row(student, mentor_email)
+
+
 @router.get("/students", response_model=List[StudentProfileResponse])
-def get_students(
+async def get_students(
+    session: AsyncSessionDep,
     mentor: MentorDep,
     name: Optional[str] = Query(None, description="Filter by name, enrollment_no or email"),
     semester: Optional[str] = Query(None, description="Filter by semester (e.g., sem1, sem2, ...)"),
-    is_ban: Optional[bool] = Query(None, description="Filter by ban status: true=banned, false=unbanned")
+    is_ban: Optional[bool] = Query(None, description="Filter by ban status: true=banned, false=unbanned"),
+    has_active_kt: Optional[bool] = Query(None, description="Filter by KTs in the latest semester"),
+    min_average_score: Optional[float] = Query(
+        None, ge=0, le=10, description="Minimum average score across semesters, on the 10-point CGPA scale"),
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE, description="Page size; the next page cursor is returned in the X-Next-Cursor header"),
+    cursor: Optional[str] = Query(None, description="Cursor from a previous page's X-Next-Cursor header"),
+    stream: bool = Query(False, description="Stream profiles as NDJSON, one per line"),
+    projection: Projection = Depends(get_projection),
 ):
-    filtered_students = mentor.students
+    statement = _students_query(
+        mentor.id, name, semester, is_ban, has_active_kt, min_average_score, projection=projection
+    )
+    if statement is None:
+        if stream:
+            return StreamingResponse(_stream_profiles(None), media_type="application/x-ndjson")
+        return []
 
-    if name:
-        name_lower = name.lower()
-        filtered_students = [
-            s for s in filtered_students
-            if s.personal_info and (
-                name_lower in (s.personal_info.name or "").lower()
-                or name_lower in (s.personal_info.enrollment_no or "").lower()
-                or name_lower in (s.personal_info.atharva_email or "").lower()
-            )
-        ]
+    statement = statement.order_by(*_sort_key())
+    if cursor:
+        statement = statement.where(tuple_(*_sort_key()) > tuple_(*_decode_cursor(cursor)))
+    if limit:
+        statement = statement.limit(limit)
 
-    if semester:
-        filtered_students = [
-            s for s in filtered_students
-            if any(m.semester == semester for m in s.marks)
-        ]
+    if stream:
+        return StreamingResponse(_stream_profiles(statement, projection), media_type="application/x-ndjson")
 
-    if is_ban is not None:
-        filtered_students = [
-            s for s in filtered_students
-            if s.personal_info and s.personal_info.is_ban == is_ban
-        ]
-
-    return [
-        StudentProfileResponse(
-            personal_info=s.personal_info,
-            achievements=s.achievements,
-            marks=s.marks,
-            counseling=s.counseling
+    students = (await session.exec(statement)).all()
+    headers = {}
+    if limit and len(students) == limit:
+        headers["X-Next-Cursor"] = _encode_cursor(students[-1])
+
+    # Already-built models: skip response_model re-validation.
+    return FastJSONResponse([projection.build(s.personal_info, s) for s in students], headers=headers)
+
+
+@router.get("/students/export")
+async def export_students(
+    mentor: MentorDep,
+    format: Literal["csv", "xlsx"] = Query("csv", description="csv (streamed) or xlsx"),
+    name: Optional[str] = Query(None, description="Filter by name, enrollment_no or email"),
+    semester: Optional[str] = Query(None, description="Filter by semester (e.g., sem1, sem2, ...)"),
+    is_ban: Optional[bool] = Query(None, description="Filter by ban status: true=banned, false=unbanned"),
+    has_active_kt: Optional[bool] = Query(None, description="Filter by KTs in the latest semester"),
+    min_average_score: Optional[float] = Query(
+        None, ge=0, le=10, description="Minimum average score across semesters, on the 10-point CGPA scale"),
+):
+    statement = _students_query(mentor.id, name, semester, is_ban, has_active_kt, min_average_score)
+    if statement is not None:
+        statement = statement.order_by(*_sort_key())
+    rows = _export_rows(statement, mentor.email)
+
+    if format == "xlsx":
+        path = await xlsx_file(rows)
+        return FileResponse(
+            path,
+            media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+            filename="roster.xlsx",
+            background=BackgroundTask(os.unlink, path),
         )
-        for s in filtered_students
-    ]
+    return StreamingResponse(
+        csv_chunks(rows),
+        media_type="text/csv; charset=utf-8",
+        headers={"Content-Disposition": 'attachment; filename="roster.csv"'},
+    )
+
+
+@router.get("/stats", response_model=MentorStats)
+async def get_stats(session: AsyncSessionDep, mentor: MentorDep):
+    """Counts and distributions over the mentor's roster; cached for
+    STATS_CACHE_TTL seconds."""
+    return await mentor_stats(session, mentor.id)
+
+
+@router.get("/search", response_model=List[StudentSearchResult])
+async def search_students(
+    session: AsyncSessionDep,
+    mentor: MentorDep,
+    q: str = Query(..., min_length=2, description="Name, enrollment_no, email, sport or KT subject; typos tolerated"),
+    limit: int = Query(20, ge=1, le=100),
+    offset: int = Query(0, ge=0),
+):
+    hits = await search_backend.search(session, q, limit, offset)
+    return FastJSONResponse([
+        StudentSearchResult.model_validate({**pi.model_dump(), "score": score})
+        for pi, score in hits
+    ])
 
 
 @router.post("/ban")
-def ban_student(
-    session: SessionDep,
+async def ban_student(
+    session: AsyncSessionDep,
     mentor: MentorDep,
     email: str = Query(..., description="Student's atharva_email to ban/unban"),
     is_ban: bool = Query(..., description="True to ban, False to unban")
 ):
-    student_info = session.exec(select(PersonalInfo).where(PersonalInfo.atharva_email == email)).first()
+    # Versions are bumped in SQL so concurrent writers never share one.
+    student_info = (await session.execute(
+        update(PersonalInfo)
+        .where(PersonalInfo.atharva_email == email)
+        .values(is_ban=is_ban, version=PersonalInfo.version + 1)
+        .returning(PersonalInfo.id, PersonalInfo.version)
+    )).first()
 
     if not student_info:
         raise HTTPException(status_code=404, detail="Student not found")
 
-    student_info.is_ban = is_ban
-    session.add(student_info)
-    session.commit()
+    await session.commit()
+    invalidate_principal("student", student_info.id)
+    await invalidate_profile(student_info.id, student_info.version - 1)
+    stats_cache.delete(mentor.id)
 
     return {"message": f"Student {email} has been {'banned' if is_ban else 'unbanned'} successfully."}
+
+
+@router.post("/students/batch", response_model=StudentBatchResponse)
+async def batch_students(request: StudentBatchRequest, session: AsyncSessionDep, mentor: MentorDep):
+    """Ban, unban or reassign many students at once: one SELECT to resolve
+    the targets, one UPDATE ... WHERE id IN (...), one commit."""
+    if not (request.emails or request.ids or request.filter):
+        raise HTTPException(status_code=422, detail="Provide emails, ids or filter")
+
+    new_mentor_id = None
+    if request.action == "reassign":
+        if not request.mentor_email:
+            raise HTTPException(status_code=422, detail="mentor_email is required to reassign")
+        new_mentor_id = (await session.exec(
+            select(Mentor.id).where(Mentor.email == request.mentor_email)
+        )).first()
+        if new_mentor_id is None:
+            raise HTTPException(status_code=404, detail="Mentor not found")
+
+    selectors = []
+    if request.emails:
+        selectors.append(PersonalInfo.atharva_email.in_(request.emails))
+    if request.ids:
+        selectors.append(PersonalInfo.id.in_(request.ids))
+    if request.filter and (conditions := _roster_conditions(mentor.id, **request.filter.model_dump())):
+        selectors.append(and_(*conditions))
+    rows = (await session.exec(
+        select(PersonalInfo.id, PersonalInfo.atharva_email, PersonalInfo.is_ban,
+               PersonalInfo.version, Student.id.label("student_id"), Student.mentor_id)
+        .select_from(PersonalInfo)
+        .outerjoin(Student, Student.id == PersonalInfo.student_id)
+        .where(or_(*selectors))
+    )).all() if selectors else []
+
+    # Reassigning someone else's student needs admin rights; bans follow /ban.
+    is_admin = mentor.email.lower() in ADMIN_EMAILS
+    ban = request.action == "ban"
+    results, changed = [], []
+    for row in rows:
+        if request.action != "reassign":
+            outcome = "unchanged" if bool(row.is_ban) == ban else "updated"
+        elif row.student_id is None:
+            outcome = "not_found"
+        elif row.mentor_id != mentor.id and not is_admin:
+            outcome = "forbidden"
+        else:
+            outcome = "unchanged" if row.mentor_id == new_mentor_id else "updated"
+        results.append(BatchItemResult(target=row.atharva_email, id=row.id, status=outcome))
+        if outcome == "updated":
+            changed.append(row)
+
+    found_emails = {row.atharva_email for row in rows}
+    found_ids = {row.id for row in rows}
+    results.extend(
+        BatchItemResult(target=email, status="not_found")
+        for email in dict.fromkeys(request.emails) if email not in found_emails
+    )
+    results.extend(
+        BatchItemResult(target=str(id), id=id, status="not_found")
+        for id in dict.fromkeys(request.ids) if id not in found_ids
+    )
+
+    if changed:
+        if request.action == "reassign":
+            await session.execute(
+                update(Student)
+                .where(Student.id.in_([row.student_id for row in changed]))
+                .values(mentor_id=new_mentor_id)
+            )
+        else:
+            await session.execute(
+                update(PersonalInfo)
+                .where(PersonalInfo.id.in_([row.id for row in changed]))
+                .values(is_ban=ban, version=PersonalInfo.version + 1)
+            )
+        await session.commit()
+
+    for row in changed:
+        if request.action != "reassign":
+            invalidate_principal("student", row.id)
+            await invalidate_profile(row.id, row.version)
+        stats_cache.delete(row.mentor_id)
+    if changed:
+        stats_cache.delete(mentor.id)
+        stats_cache.delete(new_mentor_id)
+
+    return StudentBatchResponse(action=request.action, updated=len(changed), results=results)
@@ -1,79 +1,156 @@
 # routers/student.py
-from fastapi import APIRouter, Depends, HTTPException, File, UploadFile, Query
+from uuid import UUID
+from fastapi import APIRouter, Depends, HTTPException, File, UploadFile, Query, Request, Response
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from sqlmodel import Session, select
-from database import get_session
-from security import verify_token
+from sqlalchemy.orm import selectinload
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+from database import get_async_session
+from security import verify_token, parse_subject, Principal, principal_cache, invalidate_principal
 from models.personal_info import PersonalInfo
 from models.mentor import Mentor
 from models.student import Student
 from models.achievement import Achievement
 from models.mark import Mark
-from models.counseling import Counseling 
+from models.counseling import Counseling
 from schema.profile import CombinedUpdateRequest, StudentProfileResponse
-from utils.image_upload import upload_image
+from services.academic_summary import refresh_summary
+from services.profile_sync import bump_version, merge_rows
+from services.search import build_search_text, search_backend
+from utils.image_upload import upload_profile_photo
+from utils.projection import FULL, Projection, get_projection
+from utils.profile_cache import profile_cache, profile_key, profile_etag, etag_matches, invalidate_profile
 
 router = APIRouter(prefix="/api/v1/student", tags=["student"])
 
 security = HTTPBearer()
 
-def get_current_student(
+
+def _profile_options():
+    # AsyncSession can't lazy load, so every relationship a profile touches is
+    # fetched up front in batched selects.
+    return selectinload(PersonalInfo.student).options(
+        selectinload(Student.achievements),
+        selectinload(Student.marks),
+        selectinload(Student.counseling),
+    )
+
+
+async def _load_profile(session: AsyncSession, personal_info_id) -> PersonalInfo:
+    return (await session.exec(
+        select(PersonalInfo)
+        .where(PersonalInfo.id == personal_info_id)
+        .options(_profile_options())
+    )).first()
+
+
+async def get_current_student(
     creds: HTTPAuthorizationCredentials = Depends(security),
-    session: Session = Depends(get_session)
+    session: AsyncSession = Depends(get_async_session)
 ):
     payload = verify_token(creds.credentials)
-    student_id = payload.get("sub")
-    if not student_id:
-        raise HTTPException(status_code=401, detail="Invalid token payload")
-    
-    student = session.get(PersonalInfo, student_id)
-    if not student:
-        raise HTTPException(status_code=401, detail="Student not found")
-    
-    return student
+    student_id = parse_subject(payload)
+
+    principal = principal_cache.get(("student", student_id))
+    if principal is None:
+        student = await session.get(PersonalInfo, student_id)
+        if not student:
+            raise HTTPException(status_code=401, detail="Student not found")
+        principal = Principal(
+            id=student.id,
+            email=student.atharva_email,
+            student_id=student.student_id,
+            is_ban=student.is_ban,
+        )
+        principal_cache.set(("student", student_id), principal)
+
+    return principal
+
+async def _profile_response(
+    request: Request,
+    session: AsyncSession,
+    personal_info_id,
+    missing_student_detail: str,
+    projection: Projection = FULL,
+) -> Response:
+    # A single-column version lookup decides between 304, a cached body and
+    # a full profile load.
+    version = (await session.exec(
+        select(PersonalInfo.version).where(PersonalInfo.id == personal_info_id)
+    )).first()
+    if version is None:
+        raise HTTPException(status_code=404, detail="Student not found")
+
+    etag = profile_etag(personal_info_id, version, "" if projection.is_full else projection.tag)
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+
+    if not projection.is_full:
+        # Sparse views are cheap to build and not cached, so they don't
+        # crowd full profiles out of the cache.
+        personal_info = (await session.exec(
+            select(PersonalInfo)
+            .where(PersonalInfo.id == personal_info_id)
+            .options(*projection.personal_info_options())
+        )).first()
+        student = personal_info.student if personal_info else None
+        if not student:
+            raise HTTPException(status_code=404, detail=missing_student_detail)
+        body = projection.build(personal_info, student).model_dump_json()
+        return Response(content=body, media_type="application/json", headers=headers)
+
+    key = profile_key(personal_info_id, version)
+    body = await profile_cache.get(key)
+    if body is None:
+        personal_info = await _load_profile(session, personal_info_id)
+        student = personal_info.student if personal_info else None
+        if not student:
+            raise HTTPException(status_code=404, detail=missing_student_detail)
+        body = StudentProfileResponse(
+            personal_info=personal_info,
+            achievements=student.achievements,
+            marks=student.marks,
+            counseling=student.counseling
+        ).model_dump_json().encode()
+        await profile_cache.set(key, body)
+
+    return Response(content=body, media_type="application/json", headers=headers)
+
 
 @router.get("/me", response_model=StudentProfileResponse)
-def get_my_profile(current_student: PersonalInfo = Depends(get_current_student)):
-    student = current_student.student
-    if not student:
-        raise HTTPException(detail="No related Student found")
-    
-    return StudentProfileResponse(
-        personal_info=current_student,
-        achievements=student.achievements,
-        marks=student.marks,
-        counseling=student.counseling
-    )
+async def get_my_profile(
+    request: Request,
+    current_student: Principal = Depends(get_current_student),
+    session: AsyncSession = Depends(get_async_session),
+    projection: Projection = Depends(get_projection),
+):
+    return await _profile_response(request, session, current_student.id, "No related Student found", projection)
 
 @router.get("/", response_model=StudentProfileResponse)
-def get_student(
+async def get_student(
+    request: Request,
     uuid: str = Query(..., description="UUID of the student"),
-    session: Session = Depends(get_session)
+    session: AsyncSession = Depends(get_async_session),
+    projection: Projection = Depends(get_projection),
 ):
-    personal_info = session.exec(
-        select(PersonalInfo).where(PersonalInfo.id == uuid)
-    ).first()
-
-    if not personal_info:
+    try:
+        personal_info_id = UUID(uuid)
+    except ValueError:
         raise HTTPException(status_code=404, detail="Student not found")
-    
-    student = personal_info.student
-    if not student:
-        raise HTTPException(status_code=404, detail="Student relation missing")
-    return StudentProfileResponse(
-        personal_info=personal_info,
-        achievements=student.achievements,
-        marks=student.marks,
-        counseling=student.counseling
-    )
+
+    return await _profile_response(request, session, personal_info_id, "Student relation missing", projection)
 
 @router.post("/personal_info")
 async def update_personal_info(
     update_data: CombinedUpdateRequest,
-    session: Session = Depends(get_session),
-    current_student: Student = Depends(get_current_student),
+    response: Response,
+    session: AsyncSession = Depends(get_async_session),
+    current_student: Principal = Depends(get_current_student),
 ):
     # print(update_data)
+    version = await bump_version(session, current_student.id)
+    current_student = await _load_profile(session, current_student.id)
     if update_data.personal_info:
         pi = current_student
         if pi:
@@ -94,35 +171,54 @@ async def update_personal_info(
             new_ach = Achievement(**update_data.achievements.dict(), student_id=student.id)
             session.add(new_ach)
 
-    # Replace marks (delete existing + add new)
+    changes = {}
+
+    # Merge marks on semester (insert/update/delete only what changed)
     if update_data.marks is not None:
-        # Delete existing
-        for mark in student.marks:
-            session.delete(mark)
-        # Add new
-        for mark_data in update_data.marks:
-            new_mark = Mark(**mark_data.dict(), student_id=student.id)
-            session.add(new_mark)
-
-    # Replace counseling records (delete existing + add new)
+        changes["marks"] = await merge_rows(
+            session, Mark, student.id, student.marks,
+            [m.dict() for m in update_data.marks],
+            key=lambda m: m["semester"],
+        )
+
+    # Merge counseling records on sr_no
     if update_data.counseling is not None:
-        for c in student.counseling:
-            session.delete(c)
-        for c_data in update_data.counseling:
-            new_c = Counseling(**c_data.dict(), student_id=student.id)
-            session.add(new_c)
+        changes["counseling"] = await merge_rows(
+            session, Counseling, student.id, student.counseling,
+            [c.dict() for c in update_data.counseling],
+            key=lambda c: c["sr_no"],
+        )
+
+    final_marks = (
+        [m.dict() for m in update_data.marks]
+        if update_data.marks is not None else student.marks
+    )
+    current_student.search_text = build_search_text(current_student, final_marks)
+    if update_data.marks is not None:
+        await refresh_summary(session, student.id, final_marks)
 
-    session.commit()
-    return {"message": "Student information updated successfully"}
+    await session.commit()
+    await invalidate_profile(current_student.id, version - 1)
+    search_backend.document_changed(current_student.id, current_student.search_text)
+    if update_data.personal_info:
+        invalidate_principal("student", current_student.id)
+    response.headers["ETag"] = profile_etag(current_student.id, version)
+    return {"message": "Student information updated successfully", "changes": changes}
 
 @router.post("/upload_photo")
 async def upload_photo(
+    response: Response,
     photo: UploadFile = File(...),
-    current_student: Student = Depends(get_current_student),
-    session: Session = Depends(get_session)
+    current_student: Principal = Depends(get_current_student),
+    session: AsyncSession = Depends(get_async_session)
 ):
-    photo_url = await upload_image(photo, current_student.id)
-    current_student.photo = photo_url
-    session.add(current_student)
-    session.commit()
-    return {"photo_url": photo_url}
+    variants = await upload_profile_photo(photo, current_student.id)
+    version = await bump_version(session, current_student.id, **variants)
+    await session.commit()
+    await invalidate_profile(current_student.id, version - 1)
+    response.headers["ETag"] = profile_etag(current_student.id, version)
+    return {
+        "photo_url": variants["photo"],
+        "photo_medium_url": variants["photo_medium"],
+        "photo_thumb_url": variants["photo_thumb"],
+    }
@@ -0,0 +1,18 @@
+from pydantic import BaseModel
+from typing import Dict, List, Optional
+
+class MentorAssignment(BaseModel):
+    email: str
+    semester: str
+    department: Optional[str]
+    capacity: Optional[int]
+    before: int
+    assigned: int
+    after: int
+
+class AssignmentReport(BaseModel):
+    dry_run: bool
+    assigned: int = 0
+    # reason -> number of students left unassigned
+    unplaced: Dict[str, int] = {}
+    mentors: List[MentorAssignment] = []
@@ -0,0 +1,31 @@
+from pydantic import BaseModel, Field
+from typing import List, Literal, Optional
+import uuid
+
+MAX_BATCH_ITEMS = 1000
+
+class StudentFilter(BaseModel):
+    """Same filters as GET /api/v1/mentor/students, over the caller's roster."""
+    name: Optional[str] = None
+    semester: Optional[str] = None
+    is_ban: Optional[bool] = None
+    has_active_kt: Optional[bool] = None
+    min_average_score: Optional[float] = Field(default=None, ge=0, le=10)  # CGPA scale
+
+class StudentBatchRequest(BaseModel):
+    action: Literal["ban", "unban", "reassign"]
+    emails: List[str] = Field(default=[], max_length=MAX_BATCH_ITEMS)
+    # PersonalInfo ids, as returned in profiles and search results
+    ids: List[uuid.UUID] = Field(default=[], max_length=MAX_BATCH_ITEMS)
+    filter: Optional[StudentFilter] = None
+    mentor_email: Optional[str] = None  # target mentor for "reassign"
+
+class BatchItemResult(BaseModel):
+    target: str
+    id: Optional[uuid.UUID] = None
+    status: Literal["updated", "unchanged", "not_found", "forbidden"]
+
+class StudentBatchResponse(BaseModel):
+    action: str
+    updated: int
+    results: List[BatchItemResult]
@@ -0,0 +1,13 @@
+from pydantic import BaseModel
+from typing import List
+
+class ImportRowError(BaseModel):
+    row: int
+    errors: List[str]
+
+class ImportReport(BaseModel):
+    total: int = 0
+    created: int = 0
+    updated: int = 0
+    failed: int = 0
+    errors: List[ImportRowError] = []
@@ -45,6 +45,7 @@ class PersonalInfoUpdate(BaseModel):
     diploma: Optional[str] = None
     sport: Optional[str] = None
     other: Optional[str] = None
+    department: Optional[str] = None
     nss_member: Optional[bool] = None
     ember_member: Optional[bool] = None
     rhythm_member: Optional[bool] = None
@@ -73,11 +74,14 @@ class PersonalInfoOut(BaseModel):
     local_address: Optional[str]
     permanent_address: Optional[str]
     photo: Optional[str]
+    photo_medium: Optional[str] = None
+    photo_thumb: Optional[str] = None
     ssc: Optional[str]
     hsc: Optional[str]
     diploma: Optional[str]
     sport: Optional[str]
     other: Optional[str]
+    department: Optional[str] = None
     nss_member: Optional[bool]
     ember_member: Optional[bool]
     rhythm_member: Optional[bool]
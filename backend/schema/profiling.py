@@ -0,0 +1,14 @@
+from pydantic import BaseModel
+
+class ProfileSummary(BaseModel):
+    id: str
+    method: str
+    path: str
+    query_string: str = ""
+    status: int
+    trigger: str
+    started_at: float
+    duration_ms: float
+    samples: int
+    queries: int
+    db_ms: float
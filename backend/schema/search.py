@@ -0,0 +1,14 @@
+from pydantic import BaseModel
+from typing import Optional
+import uuid
+
+class StudentSearchResult(BaseModel):
+    id: uuid.UUID
+    name: Optional[str]
+    enrollment_no: Optional[str]
+    atharva_email: Optional[str]
+    sport: Optional[str]
+    photo_thumb: Optional[str]
+    is_ban: Optional[bool]
+    score: float
+    model_config = {"from_attributes": True}
@@ -0,0 +1,20 @@
+from pydantic import BaseModel
+from typing import Dict, List, Optional
+
+class SemesterStats(BaseModel):
+    semester: str
+    students: int
+    with_kt: int
+
+class MentorStats(BaseModel):
+    total_students: int = 0
+    banned: int = 0
+    nss_members: int = 0
+    ember_members: int = 0
+    rhythm_members: int = 0
+    with_active_kt: int = 0
+    average_score: Optional[float] = None
+    trend: Dict[str, int] = {}
+    semesters: List[SemesterStats] = []
+    counseling_sessions: int = 0
+    counseled_students: int = 0
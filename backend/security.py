@@ -1,6 +1,11 @@
+import asyncio
+import hashlib
 import os
 import time
-from typing import Annotated
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Annotated, Optional, Tuple
 
 import jwt
 from fastapi import Depends, HTTPException, status
@@ -9,12 +14,48 @@ from passlib.hash import bcrypt
 from pydantic import BaseModel
 from models import Mentor
 
-from database import SessionDep
+from database import AsyncSessionDep
+from utils.cache import TTLCache
 
 SECRET_KEY = os.getenv("SECRET_KEY")
 ALGORITHM = os.getenv("ALGORITHM")
 EXP = int(os.getenv("EXP", 3600))
 
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", 12))
+HASH_WORKERS = int(os.getenv("HASH_WORKERS", 2))
+HASH_QUEUE_LIMIT = int(os.getenv("HASH_QUEUE_LIMIT", 32))
+
+# bcrypt releases the GIL, so a small dedicated pool hashes in parallel without
+# borrowing threads from the shared request threadpool.
+_hash_executor = ThreadPoolExecutor(max_workers=HASH_WORKERS, thread_name_prefix="bcrypt")
+_pending_hashes = 0
+
+# Mentors allowed to use admin endpoints (bulk import, profiling, ...).
+ADMIN_EMAILS = {
+    email.strip().lower() for email in os.getenv("ADMIN_EMAILS", "").split(",") if email.strip()
+}
+
+AUTH_CACHE_SIZE = int(os.getenv("AUTH_CACHE_SIZE", 10_000))
+AUTH_CACHE_TTL = float(os.getenv("AUTH_CACHE_TTL", 60))
+
+# Decoded claims keyed by token hash, and identity snapshots keyed by
+# (kind, id). Snapshots are dropped on ban/profile changes in this process;
+# AUTH_CACHE_TTL bounds staleness across workers.
+token_cache = TTLCache(AUTH_CACHE_SIZE, AUTH_CACHE_TTL)
+principal_cache = TTLCache(AUTH_CACHE_SIZE, AUTH_CACHE_TTL)
+
+
+@dataclass(frozen=True)
+class Principal:
+    id: uuid.UUID
+    email: str
+    student_id: Optional[uuid.UUID] = None
+    is_ban: Optional[bool] = None
+
+
+def invalidate_principal(kind: str, id: uuid.UUID):
+    principal_cache.delete((kind, id))
+
 
 def create_token(user_id: str):
     payload = {"sub": user_id, "exp": time.time() + EXP}
@@ -23,13 +64,30 @@ def create_token(user_id: str):
 
 
 def verify_token(token: str):
+    key = hashlib.sha256(token.encode()).digest()
+    payload = token_cache.get(key)
+    if payload is not None:
+        return payload
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM or "HS256"])
-        return payload
     except Exception as _:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token"
         )
+    # Never serve a cached token past its own expiry.
+    ttl = min(AUTH_CACHE_TTL, payload.get("exp", float("inf")) - time.time())
+    if ttl > 0:
+        token_cache.set(key, payload, ttl)
+    return payload
+
+
+def parse_subject(payload: dict) -> uuid.UUID:
+    try:
+        return uuid.UUID(payload.get("sub"))
+    except (TypeError, ValueError):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token payload"
+        )
 
 
 class Token(BaseModel):
@@ -37,18 +95,51 @@ class Token(BaseModel):
 
 
 def hash_password(password):
-    return bcrypt.hash(password)
+    return bcrypt.using(rounds=BCRYPT_ROUNDS).hash(password)
 
 
 def verify_password(password, hash):
     return bcrypt.verify(password, hash)
 
 
+def hash_queue_depth() -> int:
+    return _pending_hashes
+
+
+async def _run_hash(fn, *args):
+    global _pending_hashes
+    if _pending_hashes >= HASH_WORKERS + HASH_QUEUE_LIMIT:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Too many logins in progress, please retry",
+            headers={"Retry-After": "1"},
+        )
+    _pending_hashes += 1
+    try:
+        return await asyncio.get_running_loop().run_in_executor(_hash_executor, fn, *args)
+    finally:
+        _pending_hashes -= 1
+
+
+def _verify_and_update(password, hash) -> Tuple[bool, Optional[str]]:
+    if not bcrypt.verify(password, hash):
+        return False, None
+    if bcrypt.from_string(hash).rounds != BCRYPT_ROUNDS:
+        return True, hash_password(password)
+    return True, None
+
+
+async def verify_and_update_password(password, hash) -> Tuple[bool, Optional[str]]:
+    """Verify off the event loop; returns a replacement hash when the stored
+    one doesn't use BCRYPT_ROUNDS."""
+    return await _run_hash(_verify_and_update, password, hash)
+
+
 security = HTTPBearer()
 
 
-def get_mentor(
-    session: SessionDep,
+async def get_mentor(
+    session: AsyncSessionDep,
     bearer: Annotated[HTTPAuthorizationCredentials, Depends(security)],
 ):
     payload = verify_token(bearer.credentials)
@@ -56,11 +147,26 @@ def get_mentor(
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token"
         )
-    mentor = session.get(Mentor, payload["sub"])
-    if not mentor:
+    mentor_id = parse_subject(payload)
+    principal = principal_cache.get(("mentor", mentor_id))
+    if principal is None:
+        mentor = await session.get(Mentor, mentor_id)
+        if not mentor:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token"
+            )
+        principal = Principal(id=mentor.id, email=mentor.email)
+        principal_cache.set(("mentor", mentor_id), principal)
+    return principal
+
+MentorDep = Annotated[Principal, Depends(get_mentor)]
+
+
+def get_admin(mentor: MentorDep):
+    if mentor.email.lower() not in ADMIN_EMAILS:
         raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token"
+            status_code=status.HTTP_403_FORBIDDEN, detail="Admin access required"
         )
     return mentor
-    
-MentorDep = Annotated[Mentor, Depends(get_mentor)]
\ No newline at end of file
+
+AdminDep = Annotated[Principal, Depends(get_admin)]
@@ -0,0 +1,182 @@
+"""Per-student numeric digest of Mark rows (see models.AcademicSummary).
+
+``Mark.marks`` and ``Mark.no_of_kt`` are free text ("8.2", "78%", "7.5 CGPA",
+"2"), so they are parsed once here, on write, instead of on every dashboard
+read. Scores are stored on the 10-point CGPA scale; percentages are converted
+with PERCENT_PER_CGPA, and marks in any other format are left out rather than
+mixed in. Rows are refreshed by the profile update route and the bulk
+importer.
+
+Backfill existing data (from backend/):
+    python -m services.academic_summary [--batch-size 1000]
+"""
+import argparse
+import re
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional
+
+from sqlalchemy import delete
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlmodel import Session, select
+
+from models import AcademicSummary, Mark
+
+BACKFILL_BATCH_SIZE = 1000
+
+# The usual CGPA-to-percentage conversion: percentage = CGPA x 9.5.
+PERCENT_PER_CGPA = 9.5
+
+_NUMBER = re.compile(r"\d+(?:\.\d+)?")
+_SCORE = re.compile(r"(\d+(?:\.\d+)?)\s*(%|percent|cgpa|sgpa|cpi|gpa)?", re.IGNORECASE)
+_UPSERT = {"postgresql": postgresql.insert, "sqlite": sqlite.insert}
+
+
+def parse_number(value) -> Optional[float]:
+    """First number in a free-text field, or None if there isn't one."""
+    match = _NUMBER.search(str(value or ""))
+    return float(match.group()) if match else None
+
+
+def parse_kts(value) -> int:
+    """KT count from free text ("2", "00", "1 KT"); blanks and text without
+    a number ("none") count as 0. The mentor stats use this too, so every
+    KT figure agrees."""
+    return int(parse_number(value) or 0)
+
+
+def parse_score(value) -> Optional[float]:
+    """A mark on the 10-point CGPA scale: "8.2" and "7.5 CGPA" as given,
+    "78%" (or a bare number above 10) converted from a percentage. None
+    for blanks and anything else ("8/10", "AB", "120")."""
+    match = _SCORE.fullmatch(str(value or "").strip())
+    if not match:
+        return None
+    number, unit = float(match.group(1)), (match.group(2) or "").lower()
+    if unit in ("%", "percent") or (not unit and number > 10):
+        if number > 100:
+            return None
+        return round(min(number / PERCENT_PER_CGPA, 10.0), 2)
+    return number if number <= 10 else None
+
+
+def _field(mark, name):
+    return mark[name] if isinstance(mark, dict) else getattr(mark, name)
+
+
+def summarize(student_id, marks: Iterable) -> Optional[dict]:
+    """Summary row values for one student's final set of marks (dicts or
+    Mark objects). active_kts is the KT count on the latest semester;
+    total_kts sums every semester. None if no semester is set."""
+    by_semester = {}
+    for mark in marks:
+        semester = _field(mark, "semester")
+        if semester is None:
+            continue
+        number = int(getattr(semester, "value", semester)[3:])
+        by_semester[number] = (
+            parse_score(_field(mark, "marks")),
+            parse_kts(_field(mark, "no_of_kt")),
+        )
+    if not by_semester:
+        return None
+
+    semesters = sorted(by_semester)
+    latest_score, active_kts = by_semester[semesters[-1]]
+    scores = [by_semester[s][0] for s in semesters if by_semester[s][0] is not None]
+    previous = [by_semester[s][0] for s in semesters[:-1] if by_semester[s][0] is not None]
+
+    delta = None
+    if latest_score is not None and previous:
+        delta = round(latest_score - previous[-1], 2)
+    return {
+        "student_id": student_id,
+        "semesters_recorded": len(semesters),
+        "latest_semester": semesters[-1],
+        "latest_score": latest_score,
+        "average_score": round(sum(scores) / len(scores), 2) if scores else None,
+        "total_kts": sum(kts for _, kts in by_semester.values()),
+        "active_kts": active_kts,
+        "score_delta": delta,
+        "trend": None if delta is None else (delta > 0) - (delta < 0),
+    }
+
+
+def upsert_statement(dialect: str, rows: List[dict]):
+    """One INSERT ... ON CONFLICT (student_id) DO UPDATE for many rows."""
+    statement = _UPSERT[dialect](AcademicSummary).values(rows)
+    columns = {
+        name: statement.excluded[name]
+        for name in rows[0] if name != "student_id"
+    }
+    return statement.on_conflict_do_update(index_elements=["student_id"], set_=columns)
+
+
+def _apply(session, student_ids, summaries: List[dict]):
+    """Statements that make the given students' summaries match ``summaries``
+    (students with no semester marks lose their row)."""
+    statements = []
+    emptied = set(student_ids) - {s["student_id"] for s in summaries}
+    if emptied:
+        statements.append(delete(AcademicSummary).where(AcademicSummary.student_id.in_(emptied)))
+    if summaries:
+        statements.append(upsert_statement(session.bind.dialect.name, summaries))
+    return statements
+
+
+async def refresh_summary(session, student_id, marks: Iterable):
+    """Stage the summary for one student on an AsyncSession; the caller commits."""
+    summary = summarize(student_id, marks)
+    for statement in _apply(session, [student_id], [summary] if summary else []):
+        await session.execute(statement)
+
+
+def refresh_summaries(session: Session, marks_by_student: Dict[object, Iterable]):
+    """Stage summaries for many students in a fixed number of statements."""
+    summaries = [
+        summary for student_id, marks in marks_by_student.items()
+        if (summary := summarize(student_id, marks))
+    ]
+    for statement in _apply(session, list(marks_by_student), summaries):
+        session.execute(statement)
+
+
+def backfill(session: Session, batch_size: int = BACKFILL_BATCH_SIZE) -> int:
+    """Rebuild every summary from the mark table, a batch of students per
+    commit."""
+    total, last = 0, None
+    while True:
+        statement = (
+            select(Mark.student_id).distinct()
+            .where(Mark.student_id.is_not(None))
+            .order_by(Mark.student_id)
+            .limit(batch_size)
+        )
+        if last is not None:
+            statement = statement.where(Mark.student_id > last)
+        student_ids = session.exec(statement).all()
+        if not student_ids:
+            return total
+
+        marks = defaultdict(list)
+        for mark in session.exec(select(Mark).where(Mark.student_id.in_(student_ids))):
+            marks[mark.student_id].append(mark)
+        refresh_summaries(session, marks)
+        session.commit()
+        session.expunge_all()
+        total += len(student_ids)
+        last = student_ids[-1]
+
+
+def main():
+    from database import engine
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--batch-size", type=int, default=BACKFILL_BATCH_SIZE)
+    args = parser.parse_args()
+
+    with Session(engine) as session:
+        print(f"refreshed {backfill(session, args.batch_size)} student summaries")
+
+
+if __name__ == "__main__":
+    main()
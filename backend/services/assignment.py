@@ -0,0 +1,186 @@
+"""Assign unassigned students to mentors.
+
+A student is eligible for mentors of their current semester (one past the
+latest semester with recorded marks, sem1 if none) whose department matches;
+a blank department on either side matches any. Within those, each student
+goes to the least-loaded mentor with capacity left, so loads stay level.
+The plan is written with one UPDATE ... WHERE id IN (...) per mentor and
+batch.
+
+CLI (from backend/):
+    python -m services.assignment [--dry-run] [--default-capacity 40]
+"""
+import argparse
+import heapq
+import os
+import uuid
+from collections import defaultdict
+from dataclasses import dataclass, field
+from itertools import islice
+from typing import Dict, List, Optional
+
+from sqlalchemy import func, update
+from sqlmodel import Session, select
+
+from models import AcademicSummary, Mentor, PersonalInfo, Student
+from schema.assignment import AssignmentReport, MentorAssignment
+
+ASSIGN_BATCH_SIZE = 1000
+_capacity = os.getenv("ASSIGN_DEFAULT_CAPACITY")
+ASSIGN_DEFAULT_CAPACITY = int(_capacity) if _capacity else None
+
+NO_MENTOR = "no_matching_mentor"
+FULL = "mentors_at_capacity"
+
+
+def _norm(value: Optional[str]) -> Optional[str]:
+    return value.strip().casefold() or None if value else None
+
+
+def current_semester(latest_semester: Optional[int]) -> str:
+    return f"sem{min((latest_semester or 0) + 1, 8)}"
+
+
+@dataclass
+class _Mentor:
+    id: uuid.UUID
+    email: str
+    semester: str
+    department: Optional[str]
+    capacity: Optional[int]
+    before: int
+    students: List[uuid.UUID] = field(default_factory=list)
+
+    @property
+    def load(self) -> int:
+        return self.before + len(self.students)
+
+    @property
+    def full(self) -> bool:
+        return self.capacity is not None and self.load >= self.capacity
+
+
+@dataclass
+class AssignmentPlan:
+    mentors: List[_Mentor]
+    unplaced: Dict[str, int]
+
+    def report(self, dry_run: bool) -> AssignmentReport:
+        return AssignmentReport(
+            dry_run=dry_run,
+            assigned=sum(len(m.students) for m in self.mentors),
+            unplaced=self.unplaced,
+            mentors=[
+                MentorAssignment(
+                    email=m.email, semester=m.semester, department=m.department,
+                    capacity=m.capacity, before=m.before,
+                    assigned=len(m.students), after=m.load,
+                )
+                for m in self.mentors
+            ],
+        )
+
+
+def plan(session: Session, default_capacity: Optional[int] = ASSIGN_DEFAULT_CAPACITY) -> AssignmentPlan:
+    loads = dict(session.exec(
+        select(Student.mentor_id, func.count(Student.id))
+        .where(Student.mentor_id.is_not(None))
+        .group_by(Student.mentor_id)
+    ).all())
+    mentors = [
+        _Mentor(
+            id=id, email=email, semester=semester, department=department,
+            capacity=default_capacity if capacity is None else capacity,
+            before=loads.get(id, 0),
+        )
+        for id, email, semester, department, capacity in session.exec(
+            select(Mentor.id, Mentor.email, Mentor.semester, Mentor.department, Mentor.capacity)
+        )
+    ]
+
+    # Group students by (semester, department) so each group shares one
+    # candidate list.
+    groups = defaultdict(list)
+    for student_id, department, latest_semester in session.exec(
+        select(Student.id, PersonalInfo.department, AcademicSummary.latest_semester)
+        .outerjoin(PersonalInfo, PersonalInfo.student_id == Student.id)
+        .outerjoin(AcademicSummary, AcademicSummary.student_id == Student.id)
+        .where(Student.mentor_id.is_(None))
+        .order_by(func.coalesce(PersonalInfo.enrollment_no, ""), Student.id)
+    ):
+        groups[current_semester(latest_semester), _norm(department)].append(student_id)
+
+    candidates = {
+        key: [
+            m for m in mentors
+            if _norm(m.semester) == key[0]
+            and (_norm(m.department) is None or key[1] is None or _norm(m.department) == key[1])
+        ]
+        for key in groups
+    }
+
+    unplaced = defaultdict(int)
+    # Most constrained groups first, so they aren't crowded out by groups
+    # that could have used other mentors.
+    for key in sorted(groups, key=lambda k: len(candidates[k])):
+        students, pool = groups[key], candidates[key]
+        if not pool:
+            unplaced[NO_MENTOR] += len(students)
+            continue
+        heap = [(m.load, m.email, i) for i, m in enumerate(pool) if not m.full]
+        heapq.heapify(heap)
+        for n, student_id in enumerate(students):
+            # Loads also change through other groups sharing a mentor, so
+            # re-check each popped entry against the live value.
+            while heap and (heap[0][0] != pool[heap[0][2]].load or pool[heap[0][2]].full):
+                _, email, i = heapq.heappop(heap)
+                if not pool[i].full:
+                    heapq.heappush(heap, (pool[i].load, email, i))
+            if not heap:
+                unplaced[FULL] += len(students) - n
+                break
+            _, email, i = heapq.heappop(heap)
+            pool[i].students.append(student_id)
+            if not pool[i].full:
+                heapq.heappush(heap, (pool[i].load, email, i))
+
+    return AssignmentPlan(mentors=mentors, unplaced=dict(unplaced))
+
+
+def apply(session: Session, assignment: AssignmentPlan):
+    """Write the plan in one transaction. Students assigned meanwhile by
+    someone else are left alone."""
+    for mentor in assignment.mentors:
+        students = iter(mentor.students)
+        while batch := list(islice(students, ASSIGN_BATCH_SIZE)):
+            session.execute(
+                update(Student)
+                .where(Student.id.in_(batch), Student.mentor_id.is_(None))
+                .values(mentor_id=mentor.id)
+            )
+    session.commit()
+
+
+def assign(session: Session, dry_run: bool = False, default_capacity: Optional[int] = ASSIGN_DEFAULT_CAPACITY):
+    assignment = plan(session, default_capacity)
+    if not dry_run:
+        apply(session, assignment)
+    return assignment
+
+
+def main():
+    from database import engine
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--dry-run", action="store_true")
+    parser.add_argument("--default-capacity", type=int, default=ASSIGN_DEFAULT_CAPACITY,
+                        help="Capacity for mentors without one (default: unlimited)")
+    args = parser.parse_args()
+
+    with Session(engine) as session:
+        assignment = assign(session, args.dry_run, args.default_capacity)
+    print(assignment.report(args.dry_run).model_dump_json(indent=2))
+
+
+if __name__ == "__main__":
+    main()
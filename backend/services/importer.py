@@ -0,0 +1,254 @@
+"""Bulk import of students, mentor assignments and semester marks.
+
+One row per student. Columns: ``atharva_email`` and ``name`` (required for
+new students), any ``PersonalInfoUpdate`` field, ``mentor_email``, and per
+semester ``semN_marks`` / ``semN_no_of_kt`` / ``semN_kt_subject``.
+
+CLI (from backend/):
+    python -m services.importer students.csv [--chunk-size 500]
+"""
+import argparse
+import csv
+import io
+import uuid
+from dataclasses import dataclass, field
+from itertools import islice
+from typing import BinaryIO, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from pydantic import ValidationError
+from sqlalchemy import delete, func, insert, tuple_, update
+from sqlmodel import Session, select
+
+from models import Mark, Mentor, PersonalInfo, Student
+from models.mark import Sem
+from schema.imports import ImportReport, ImportRowError
+from schema.profile import MarkUpdate, PersonalInfoUpdate
+from services.academic_summary import refresh_summaries
+from services.search import build_search_text
+
+IMPORT_CHUNK_SIZE = 500
+
+
+@dataclass
+class ParsedRow:
+    line: int
+    email: str
+    personal_info: PersonalInfoUpdate
+    mentor_email: Optional[str]
+    marks: List[MarkUpdate]
+
+
+@dataclass
+class ImportResult:
+    report: ImportReport = field(default_factory=ImportReport)
+    # (personal_info_id, search_text) for rows written, for cache/index upkeep.
+    changed: List[Tuple[uuid.UUID, str]] = field(default_factory=list)
+
+
+def read_rows(file: BinaryIO, filename: str) -> Iterator[Tuple[int, Dict[str, str]]]:
+    """Yield (line number, row dict) without loading the whole file."""
+    if filename.lower().endswith(".xlsx"):
+        from openpyxl import load_workbook
+
+        sheet = load_workbook(file, read_only=True, data_only=True).active
+        rows = sheet.iter_rows(values_only=True)
+        header = [str(h).strip() if h is not None else "" for h in next(rows, ())]
+        for line, values in enumerate(rows, start=2):
+            yield line, {
+                h: ("" if v is None else str(v).strip()) for h, v in zip(header, values) if h
+            }
+    else:
+        reader = csv.DictReader(io.TextIOWrapper(file, encoding="utf-8-sig", newline=""))
+        for line, row in enumerate(reader, start=2):
+            yield line, {k.strip(): (v or "").strip() for k, v in row.items() if k}
+
+
+def parse_row(line: int, raw: Dict[str, str]) -> ParsedRow:
+    email = raw.get("atharva_email", "").lower()
+    if not email:
+        raise ValueError("atharva_email is required")
+    personal = {
+        name: raw[name] for name in PersonalInfoUpdate.model_fields
+        if raw.get(name)
+    }
+    personal["atharva_email"] = email
+    marks = [
+        MarkUpdate(
+            semester=sem,
+            marks=raw.get(f"{sem.value}_marks", ""),
+            no_of_kt=raw.get(f"{sem.value}_no_of_kt") or "0",
+            kt_subject=raw.get(f"{sem.value}_kt_subject", ""),
+        )
+        for sem in Sem
+        if raw.get(f"{sem.value}_marks")
+    ]
+    return ParsedRow(
+        line=line,
+        email=email,
+        personal_info=PersonalInfoUpdate(**personal),
+        mentor_email=raw.get("mentor_email", "").lower() or None,
+        marks=marks,
+    )
+
+
+def _errors(exc: Exception) -> List[str]:
+    if isinstance(exc, ValidationError):
+        return [f"{'.'.join(map(str, e['loc']))}: {e['msg']}" for e in exc.errors()]
+    return [str(exc)]
+
+
+def _write_chunk(session: Session, rows: List[ParsedRow], mentors: Dict[str, uuid.UUID]) -> ImportResult:
+    """Stage one chunk as a fixed number of bulk statements; the caller
+    commits and merges the returned result."""
+    result = ImportResult()
+    report = result.report
+    # Row emails are lowercased; stored ones (OAuth provisioning keeps
+    # Google's casing) may not be.
+    existing = {
+        pi.atharva_email.lower(): pi
+        for pi in session.exec(
+            select(PersonalInfo).where(func.lower(PersonalInfo.atharva_email).in_([r.email for r in rows]))
+        )
+    }
+    existing_marks: Dict[uuid.UUID, List[Mark]] = {}
+    student_ids = [pi.student_id for pi in existing.values() if pi.student_id]
+    if student_ids:
+        for mark in session.exec(select(Mark).where(Mark.student_id.in_(student_ids))):
+            existing_marks.setdefault(mark.student_id, []).append(mark)
+
+    new_students, new_infos, new_marks = [], [], []
+    info_updates, mentor_updates, replaced_marks = [], [], []
+    summaries: Dict[uuid.UUID, list] = {}
+    for row in rows:
+        mentor_id = None
+        if row.mentor_email:
+            mentor_id = mentors.get(row.mentor_email)
+            if mentor_id is None:
+                report.errors.append(ImportRowError(row=row.line, errors=[f"unknown mentor_email '{row.mentor_email}'"]))
+                continue
+
+        fields = row.personal_info.model_dump(exclude_none=True)
+        current = existing.get(row.email)
+        if current is None:
+            if not fields.get("name"):
+                report.errors.append(ImportRowError(row=row.line, errors=["name is required for new students"]))
+                continue
+            student_id = uuid.uuid4()
+            new_students.append({"id": student_id, "mentor_id": mentor_id})
+            pi = PersonalInfo(**fields, student_id=student_id)
+            final_marks = [m.model_dump() for m in row.marks]
+            pi.search_text = build_search_text(pi, final_marks)
+            new_infos.append(pi.model_dump())
+        else:
+            student_id = current.student_id
+            if student_id is None:
+                student_id = uuid.uuid4()
+                new_students.append({"id": student_id, "mentor_id": mentor_id})
+            elif mentor_id:
+                mentor_updates.append({"id": student_id, "mentor_id": mentor_id})
+            imported = {m.semester for m in row.marks}
+            replaced_marks.extend((student_id, sem) for sem in imported)
+            final_marks = [
+                m for m in existing_marks.get(student_id, []) if m.semester not in imported
+            ] + [m.model_dump() for m in row.marks]
+            # Detached copy: the loaded row is never dirtied, so the ORM
+            # doesn't flush a second per-row UPDATE.
+            pi = PersonalInfo(**{**current.model_dump(), **fields, "student_id": student_id})
+            pi.search_text = build_search_text(pi, final_marks)
+            info_updates.append({**fields, "id": pi.id, "student_id": student_id, "search_text": pi.search_text})
+
+        new_marks.extend({**m.model_dump(), "id": uuid.uuid4(), "student_id": student_id} for m in row.marks)
+        if row.marks:
+            summaries[student_id] = final_marks
+        result.changed.append((pi.id, pi.search_text))
+
+    if new_students:
+        session.execute(insert(Student), new_students)
+    if new_infos:
+        session.execute(insert(PersonalInfo), new_infos)
+    if info_updates:
+        session.execute(update(PersonalInfo), info_updates)
+        session.execute(
+            update(PersonalInfo)
+            .where(PersonalInfo.id.in_([u["id"] for u in info_updates]))
+            .values(version=PersonalInfo.version + 1)
+        )
+    if mentor_updates:
+        session.execute(update(Student), mentor_updates)
+    if replaced_marks:
+        session.execute(delete(Mark).where(tuple_(Mark.student_id, Mark.semester).in_(replaced_marks)))
+    if new_marks:
+        session.execute(insert(Mark), new_marks)
+    if summaries:
+        refresh_summaries(session, summaries)
+
+    report.created = len(new_infos)
+    report.updated = len(info_updates)
+    return result
+
+
+def import_rows(
+    session: Session,
+    rows: Iterable[Tuple[int, Dict[str, str]]],
+    chunk_size: int = IMPORT_CHUNK_SIZE,
+) -> ImportResult:
+    """Validate and write rows in chunks, committing once per chunk. A chunk
+    that fails at the database is rolled back and reported row by row."""
+    result = ImportResult()
+    report = result.report
+    mentors = dict(session.exec(select(Mentor.email, Mentor.id)).all())
+    mentors = {email.lower(): id for email, id in mentors.items()}
+    seen = set()
+
+    rows = iter(rows)
+    while chunk := list(islice(rows, chunk_size)):
+        parsed = []
+        for line, raw in chunk:
+            report.total += 1
+            try:
+                row = parse_row(line, raw)
+            except (ValidationError, ValueError) as e:
+                report.errors.append(ImportRowError(row=line, errors=_errors(e)))
+                continue
+            if row.email in seen:
+                report.errors.append(ImportRowError(row=line, errors=[f"duplicate atharva_email '{row.email}' in file"]))
+                continue
+            seen.add(row.email)
+            parsed.append(row)
+
+        if not parsed:
+            continue
+        try:
+            written = _write_chunk(session, parsed, mentors)
+            session.commit()
+        except Exception as e:
+            session.rollback()
+            report.errors.extend(ImportRowError(row=row.line, errors=_errors(e)) for row in parsed)
+            continue
+        finally:
+            session.expunge_all()
+        report.created += written.report.created
+        report.updated += written.report.updated
+        report.errors.extend(written.report.errors)
+        result.changed.extend(written.changed)
+
+    report.errors.sort(key=lambda e: e.row)
+    report.failed = len(report.errors)
+    return result
+
+
+def main():
+    from database import engine
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("path")
+    parser.add_argument("--chunk-size", type=int, default=IMPORT_CHUNK_SIZE)
+    args = parser.parse_args()
+
+    with open(args.path, "rb") as file, Session(engine) as session:
+        result = import_rows(session, read_rows(file, args.path), args.chunk_size)
+    print(result.report.model_dump_json(indent=2))
+
+
+if __name__ == "__main__":
+    main()
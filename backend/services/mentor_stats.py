@@ -0,0 +1,104 @@
+"""Roster-wide counts for the mentor dashboard, computed with one GROUP BY
+query per table and cached briefly per mentor."""
+import os
+
+from sqlalchemy import Integer, case, cast, func
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from models import AcademicSummary, Counseling, Mark, PersonalInfo, Student
+from schema.stats import MentorStats, SemesterStats
+from services.academic_summary import parse_kts
+from utils.cache import TTLCache
+
+STATS_CACHE_SIZE = int(os.getenv("STATS_CACHE_SIZE", 1_000))
+STATS_CACHE_TTL = float(os.getenv("STATS_CACHE_TTL", 30))
+
+stats_cache = TTLCache(STATS_CACHE_SIZE, STATS_CACHE_TTL)
+
+TRENDS = {1: "up", 0: "flat", -1: "down"}
+
+
+def _count_if(condition):
+    return func.coalesce(func.sum(cast(case((condition, 1), else_=0), Integer)), 0)
+
+
+async def _compute(session: AsyncSession, mentor_id) -> MentorStats:
+    roster = Student.mentor_id == mentor_id
+
+    total, banned, nss, ember, rhythm = (await session.exec(
+        select(
+            func.count(Student.id),
+            _count_if(PersonalInfo.is_ban.is_(True)),
+            _count_if(PersonalInfo.nss_member.is_(True)),
+            _count_if(PersonalInfo.ember_member.is_(True)),
+            _count_if(PersonalInfo.rhythm_member.is_(True)),
+        )
+        .select_from(Student)
+        .outerjoin(PersonalInfo, PersonalInfo.student_id == Student.id)
+        .where(roster)
+    )).one()
+    stats = MentorStats(
+        total_students=total, banned=banned,
+        nss_members=nss, ember_members=ember, rhythm_members=rhythm,
+    )
+
+    # no_of_kt is free text. Parse the roster's few distinct values the way
+    # the academic summary does (with_active_kt below reads that), so "00",
+    # "0 KT" and "none" aren't a KT here and not there.
+    kt_values = [
+        value for value in await session.exec(
+            select(Mark.no_of_kt).distinct()
+            .join(Student, Student.id == Mark.student_id)
+            .where(roster)
+        )
+        if parse_kts(value)
+    ]
+    has_kt = Mark.no_of_kt.in_(kt_values)
+    semesters = await session.exec(
+        select(Mark.semester, func.count(func.distinct(Mark.student_id)), _count_if(has_kt))
+        .join(Student, Student.id == Mark.student_id)
+        .where(roster, Mark.semester.is_not(None))
+        .group_by(Mark.semester)
+        .order_by(Mark.semester)
+    )
+    stats.semesters = [
+        SemesterStats(semester=semester.value, students=students, with_kt=with_kt)
+        for semester, students, with_kt in semesters
+    ]
+
+    scored = scores = 0
+    for trend, students, active, score_sum, score_count in await session.exec(
+        select(
+            AcademicSummary.trend,
+            func.count(),
+            _count_if(AcademicSummary.active_kts > 0),
+            func.sum(AcademicSummary.average_score),
+            func.count(AcademicSummary.average_score),
+        )
+        .join(Student, Student.id == AcademicSummary.student_id)
+        .where(roster)
+        .group_by(AcademicSummary.trend)
+    ):
+        stats.with_active_kt += active
+        scores += score_sum or 0
+        scored += score_count
+        if trend is not None:
+            stats.trend[TRENDS[trend]] = students
+    if scored:
+        stats.average_score = round(scores / scored, 2)
+
+    stats.counseling_sessions, stats.counseled_students = (await session.exec(
+        select(func.count(Counseling.id), func.count(func.distinct(Counseling.student_id)))
+        .join(Student, Student.id == Counseling.student_id)
+        .where(roster)
+    )).one()
+    return stats
+
+
+async def mentor_stats(session: AsyncSession, mentor_id) -> MentorStats:
+    stats = stats_cache.get(mentor_id)
+    if stats is None:
+        stats = await _compute(session, mentor_id)
+        stats_cache.set(mentor_id, stats)
+    return stats
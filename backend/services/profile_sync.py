@@ -0,0 +1,66 @@
+from collections import defaultdict
+from typing import Callable, Dict, List, Sequence, Type
+
+from sqlalchemy import delete, insert, update
+from sqlmodel import SQLModel
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from models import PersonalInfo
+
+
+async def bump_version(session: AsyncSession, personal_info_id, **values) -> int:
+    """Increment PersonalInfo.version in SQL (optionally writing ``values``
+    in the same UPDATE) and return the new version.
+
+    The UPDATE holds the row lock until commit, so concurrent writers get
+    distinct versions and each version names exactly one committed body.
+    Call it before reading the profile to serialize writers on the row.
+    """
+    return (await session.execute(
+        update(PersonalInfo)
+        .where(PersonalInfo.id == personal_info_id)
+        .values(**values, version=PersonalInfo.version + 1)
+        .returning(PersonalInfo.version)
+        # Callers use the returned version, not a loaded object's copy.
+        .execution_options(synchronize_session=False)
+    )).scalar_one()
+
+
+async def merge_rows(
+    session: AsyncSession,
+    model: Type[SQLModel],
+    student_id,
+    existing: Sequence[SQLModel],
+    incoming: List[dict],
+    key: Callable[[dict], object],
+) -> Dict[str, int]:
+    """Make ``student_id``'s ``model`` rows equal ``incoming``.
+
+    Rows are paired on their natural ``key``; duplicates pair off in order,
+    so the end state is the same as delete-all/insert-all. Only changed rows
+    are written, each kind of write in a single batched statement.
+    """
+    by_key = defaultdict(list)
+    for row in existing:
+        by_key[key(row.model_dump())].append(row)
+
+    inserts, updates = [], []
+    for values in incoming:
+        matches = by_key.get(key(values))
+        if not matches:
+            inserts.append({**values, "student_id": student_id})
+            continue
+        row = matches.pop(0)
+        if any(getattr(row, field) != value for field, value in values.items()):
+            updates.append({**values, "id": row.id})
+
+    deletes = [row.id for rows in by_key.values() for row in rows]
+
+    if deletes:
+        await session.execute(delete(model).where(model.id.in_(deletes)))
+    if updates:
+        await session.execute(update(model), updates)
+    if inserts:
+        await session.execute(insert(model), inserts)
+
+    return {"inserted": len(inserts), "updated": len(updates), "deleted": len(deletes)}
@@ -0,0 +1,54 @@
+"""Create-or-link the PersonalInfo/Student pair behind an OAuth login."""
+import uuid
+
+from sqlalchemy import delete, func, insert
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from models import PersonalInfo, Student
+from security import invalidate_principal
+from services.search import build_search_text, search_backend
+
+_UPSERT = {"postgresql": postgresql.insert, "sqlite": sqlite.insert}
+
+_COLUMNS = (PersonalInfo.id, PersonalInfo.atharva_email, PersonalInfo.name, PersonalInfo.photo,
+            PersonalInfo.student_id, PersonalInfo.search_text)
+
+
+async def provision_student(session: AsyncSession, email: str, name: str):
+    """Return (id, atharva_email, name, photo, student_id, search_text) for ``email``,
+    creating and linking the rows on first login.
+
+    Returning users cost one SELECT. A first login is one transaction: insert
+    a Student, then upsert PersonalInfo on atharva_email, linking the new
+    Student only if the row has none. Concurrent duplicate callbacks
+    serialize on the unique index; the loser sees an existing link and drops
+    its spare Student before committing.
+    """
+    user = (await session.exec(select(*_COLUMNS).where(PersonalInfo.atharva_email == email))).first()
+    if user is not None and user.student_id is not None:
+        return user
+
+    student_id = uuid.uuid4()
+    search_text = build_search_text(PersonalInfo(name=name, atharva_email=email), [])
+    statement = _UPSERT[session.bind.dialect.name](PersonalInfo).values(
+        id=uuid.uuid4(), atharva_email=email, name=name,
+        student_id=student_id, search_text=search_text,
+    )
+    statement = statement.on_conflict_do_update(
+        index_elements=["atharva_email"],
+        set_={"student_id": func.coalesce(PersonalInfo.student_id, statement.excluded.student_id)},
+    ).returning(*_COLUMNS)
+
+    await session.execute(insert(Student).values(id=student_id))
+    user = (await session.execute(statement)).one()
+    if user.student_id != student_id:
+        await session.execute(delete(Student).where(Student.id == student_id))
+    await session.commit()
+
+    if user.student_id == student_id:
+        invalidate_principal("student", user.id)
+        if user.search_text:
+            search_backend.document_changed(user.id, user.search_text)
+    return user
@@ -0,0 +1,95 @@
+"""Flatten a roster into CSV/XLSX rows.
+
+Column names match services.importer, so an export can be edited and
+re-imported.
+"""
+import csv
+import io
+import os
+import tempfile
+from typing import AsyncIterator, List
+
+from fastapi.concurrency import run_in_threadpool
+
+from models import Student
+from models.mark import Sem
+
+EXPORT_BUFFER_BYTES = 64 * 1024
+# Rows handed to a worker thread per openpyxl append batch.
+XLSX_BATCH_ROWS = 500
+
+PERSONAL_COLUMNS = [
+    "atharva_email", "name", "enrollment_no", "date_of_birth", "blood_group",
+    "aadhar_no", "personal_email", "mobile_no", "father_name", "father_occupation",
+    "father_mobile", "mother_name", "mother_occupation", "mother_mobile",
+    "local_address", "permanent_address", "ssc", "hsc", "diploma", "sport", "other",
+    "department", "nss_member", "ember_member", "rhythm_member", "is_ban", "photo",
+]
+MARK_FIELDS = ["marks", "no_of_kt", "kt_subject"]
+COLUMNS = (
+    PERSONAL_COLUMNS
+    + ["mentor_email"]
+    + [f"{sem.value}_{field}" for sem in Sem for field in MARK_FIELDS]
+    + ["counseling"]
+)
+
+
+def export_row(student: Student, mentor_email: str) -> List:
+    pi = student.personal_info
+    row = [getattr(pi, column, None) if pi else None for column in PERSONAL_COLUMNS]
+    row.append(mentor_email)
+
+    by_semester = {m.semester: m for m in student.marks}
+    for sem in Sem:
+        mark = by_semester.get(sem)
+        row.extend(getattr(mark, field) if mark else None for field in MARK_FIELDS)
+
+    row.append("; ".join(
+        f"{c.sr_no}. {c.topic} ({c.date}): {c.action_taken} - {c.remark}"
+        for c in sorted(student.counseling, key=lambda c: c.sr_no)
+    ))
+    return row
+
+
+async def csv_chunks(rows: AsyncIterator[List]) -> AsyncIterator[str]:
+    """Yield CSV text in ~64 KiB pieces; memory stays flat however many rows."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    buffer.write("\ufeff")  # lets Excel detect UTF-8
+    writer.writerow(COLUMNS)
+    async for row in rows:
+        writer.writerow(row)
+        if buffer.tell() >= EXPORT_BUFFER_BYTES:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue()
+
+
+def _append_rows(sheet, rows: List[List]):
+    for row in rows:
+        sheet.append(row)
+
+
+async def xlsx_file(rows: AsyncIterator[List]) -> str:
+    """Write rows to a temporary .xlsx and return its path. openpyxl's
+    write-only mode spools rows to disk, so memory stays flat; the zip
+    container can only be emitted once the sheet is complete. Rows are
+    serialized in batches on the threadpool, keeping cell conversion off
+    the event loop."""
+    from openpyxl import Workbook
+
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet("Roster")
+    batch = [COLUMNS]
+    async for row in rows:
+        batch.append(row)
+        if len(batch) >= XLSX_BATCH_ROWS:
+            await run_in_threadpool(_append_rows, sheet, batch)
+            batch = []
+    await run_in_threadpool(_append_rows, sheet, batch)
+
+    fd, path = tempfile.mkstemp(suffix=".xlsx")
+    os.close(fd)
+    await run_in_threadpool(workbook.save, path)
+    return path
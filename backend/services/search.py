@@ -0,0 +1,132 @@
+import asyncio
+import heapq
+import os
+from collections import defaultdict
+from typing import Iterable, List, Tuple
+
+from sqlalchemy import func, or_
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from database import async_engine
+from models import PersonalInfo
+
+SEARCH_MIN_SCORE = float(os.getenv("SEARCH_MIN_SCORE", 0.3))
+
+
+def build_search_text(personal_info: PersonalInfo, marks: Iterable) -> str:
+    """The denormalized text both backends search over: identity fields,
+    sport and KT subjects."""
+    kt_subjects = [
+        m["kt_subject"] if isinstance(m, dict) else m.kt_subject
+        for m in marks
+    ]
+    parts = [
+        personal_info.name,
+        personal_info.enrollment_no,
+        personal_info.atharva_email,
+        personal_info.sport,
+        *kt_subjects,
+    ]
+    return " ".join(p for p in parts if p).lower()
+
+
+def trigrams(text: str) -> set:
+    # pg_trgm style: each word padded with two leading and one trailing space.
+    grams = set()
+    for word in text.lower().split():
+        padded = f"  {word} "
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return grams
+
+
+class PostgresSearch:
+    """pg_trgm word similarity for typos/partials, plus full-text rank for
+    whole-word matches; both backed by GIN indexes on search_text."""
+
+    async def search(self, session: AsyncSession, q: str, limit: int, offset: int):
+        q = q.lower()
+        tsquery = func.plainto_tsquery("simple", q)
+        tsvector = func.to_tsvector("simple", PersonalInfo.search_text)
+        score = func.greatest(
+            func.word_similarity(q, PersonalInfo.search_text),
+            func.ts_rank(tsvector, tsquery),
+        ).label("score")
+        rows = (await session.exec(
+            select(PersonalInfo, score)
+            .where(or_(PersonalInfo.search_text.op("%>")(q), tsvector.op("@@")(tsquery)))
+            .order_by(score.desc(), PersonalInfo.id)
+            .offset(offset)
+            .limit(limit)
+        )).all()
+        return [(pi, float(s)) for pi, s in rows]
+
+    def document_changed(self, personal_info_id, search_text: str):
+        pass
+
+
+class NgramSearch:
+    """In-process trigram index for SQLite/dev. Built lazily from
+    search_text and kept current by document_changed in this process."""
+
+    def __init__(self):
+        self.postings = defaultdict(set)
+        self.documents = {}
+        self._loaded = False
+        self._lock = asyncio.Lock()
+
+    def document_changed(self, personal_info_id, search_text: str):
+        if not self._loaded:
+            return
+        for gram in self.documents.pop(personal_info_id, ()):
+            self.postings[gram].discard(personal_info_id)
+        grams = frozenset(trigrams(search_text or ""))
+        self.documents[personal_info_id] = grams
+        for gram in grams:
+            self.postings[gram].add(personal_info_id)
+
+    async def _load(self, session: AsyncSession):
+        async with self._lock:
+            if self._loaded:
+                return
+            rows = await session.exec(select(
+                PersonalInfo.id, PersonalInfo.search_text, PersonalInfo.name,
+                PersonalInfo.enrollment_no, PersonalInfo.atharva_email, PersonalInfo.sport,
+            ))
+            self._loaded = True
+            for id, search_text, *fields in rows:
+                self.document_changed(id, search_text or " ".join(f for f in fields if f))
+
+    def rank(self, q: str, top: int) -> List[Tuple[object, float]]:
+        query = trigrams(q)
+        if not query:
+            return []
+        # A document scoring SEARCH_MIN_SCORE shares at least `need` of the
+        # query's trigrams, so it is in the postings of at least one of the
+        # len(query) - need + 1 rarest ones. Skipping the commonest grams
+        # ("stu", "  s") that way keeps the candidate set small without
+        # losing any match.
+        n = len(query)
+        need = next((k for k in range(1, n + 1) if k / n >= SEARCH_MIN_SCORE), n + 1)
+        rarest = sorted(query, key=lambda g: len(self.postings.get(g, ())))[:n - need + 1]
+        candidates = set().union(*(self.postings.get(gram, ()) for gram in rarest))
+        scored = (
+            (len(query & self.documents[id]) / len(query), id)
+            for id in candidates
+        )
+        best = heapq.nlargest(top, (item for item in scored if item[0] >= SEARCH_MIN_SCORE))
+        return [(id, score) for score, id in best]
+
+    async def search(self, session: AsyncSession, q: str, limit: int, offset: int):
+        await self._load(session)
+        page = self.rank(q, offset + limit)[offset:]
+        if not page:
+            return []
+        rows = (await session.exec(
+            select(PersonalInfo).where(PersonalInfo.id.in_([id for id, _ in page]))
+        )).all()
+        by_id = {pi.id: pi for pi in rows}
+        return [(by_id[id], score) for id, score in page if id in by_id]
+
+
+search_backend = PostgresSearch() if async_engine.dialect.name == "postgresql" else NgramSearch()
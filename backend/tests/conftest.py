@@ -0,0 +1,32 @@
+import os
+import sys
+import tempfile
+
+import pytest
+
+# The app's modules read their settings at import time; point them at a
+# throwaway SQLite file (never DB_URL from the environment) before any import.
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ["DB_URL"] = f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'test.db')}"
+os.environ.pop("ASYNC_DB_URL", None)
+os.environ.setdefault("SECRET_KEY", "test-secret")
+os.environ.setdefault("ALGORITHM", "HS256")
+os.environ.setdefault("GOOGLE_CLIENT_ID", "test-client")
+os.environ.setdefault("GOOGLE_CLIENT_SECRET", "test-client-secret")
+# Served by tests/stub_idp.py through the idp fixture in test_auth.py.
+os.environ["OIDC_DISCOVERY_URL"] = "http://idp.test/.well-known/openid-configuration"
+
+
+@pytest.fixture
+def db():
+    """Empty tables and cold auth caches for each test."""
+    from sqlmodel import SQLModel
+
+    import database
+    from security import principal_cache, token_cache
+
+    SQLModel.metadata.drop_all(database.engine)
+    SQLModel.metadata.create_all(database.engine)
+    principal_cache.clear()
+    token_cache.clear()
+    return database
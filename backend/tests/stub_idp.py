@@ -0,0 +1,111 @@
+"""Minimal local OpenID provider for the auth tests and manual logins.
+
+Serves discovery, JWKS, an authorize endpoint that approves immediately,
+a token endpoint issuing RS256 ID tokens, and userinfo. The signing key is
+generated at startup; rotate_key() swaps it, and ``hits`` counts requests
+per path. The tests mount it on utils.oidc's transport; to log in against
+it by hand (from backend/):
+
+    uvicorn tests.stub_idp:app --port 9000
+    OIDC_DISCOVERY_URL=http://localhost:9000/.well-known/openid-configuration
+
+The logged-in user comes from ``login_hint`` on the authorize request, or
+STUB_IDP_EMAIL / STUB_IDP_NAME.
+"""
+import os
+import secrets
+import time
+from collections import Counter
+from urllib.parse import urlencode
+
+from authlib.jose import JsonWebKey, jwt
+from fastapi import FastAPI, Form, HTTPException, Request
+from fastapi.responses import RedirectResponse
+
+STUB_IDP_EMAIL = os.getenv("STUB_IDP_EMAIL", "student@atharva.edu")
+STUB_IDP_NAME = os.getenv("STUB_IDP_NAME", "Test Student")
+
+app = FastAPI()
+# code -> (client_id, claims); access token -> claims
+_codes = {}
+_tokens = {}
+hits = Counter()
+
+
+def _new_key():
+    return JsonWebKey.generate_key("RSA", 2048, is_private=True, options={"kid": secrets.token_hex(8)})
+
+
+key = _new_key()
+
+
+def rotate_key():
+    """Sign with (and publish only) a fresh key, as an IdP rotation would."""
+    global key
+    key = _new_key()
+
+
+@app.middleware("http")
+async def count_hits(request: Request, call_next):
+    hits[request.url.path] += 1
+    return await call_next(request)
+
+
+def _issuer(request: Request) -> str:
+    return str(request.base_url).rstrip("/")
+
+
+@app.get("/.well-known/openid-configuration")
+def discovery(request: Request):
+    issuer = _issuer(request)
+    return {
+        "issuer": issuer,
+        "authorization_endpoint": f"{issuer}/authorize",
+        "token_endpoint": f"{issuer}/token",
+        "userinfo_endpoint": f"{issuer}/userinfo",
+        "jwks_uri": f"{issuer}/jwks",
+        "response_types_supported": ["code"],
+        "subject_types_supported": ["public"],
+        "id_token_signing_alg_values_supported": ["RS256"],
+    }
+
+
+@app.get("/jwks")
+def jwks():
+    return {"keys": [key.as_dict(is_private=False)]}
+
+
+@app.get("/authorize")
+def authorize(
+    request: Request, client_id: str, redirect_uri: str, state: str,
+    nonce: str = "", login_hint: str = "",
+):
+    email = login_hint or STUB_IDP_EMAIL
+    code = secrets.token_urlsafe(16)
+    _codes[code] = (client_id, {
+        "iss": _issuer(request), "sub": email, "email": email, "email_verified": True,
+        "name": STUB_IDP_NAME if email == STUB_IDP_EMAIL else email.split("@")[0],
+        "nonce": nonce,
+    })
+    return RedirectResponse(f"{redirect_uri}?{urlencode({'code': code, 'state': state})}", status_code=302)
+
+
+@app.post("/token")
+def token(code: str = Form(...), client_id: str = Form(None)):
+    if code not in _codes:
+        raise HTTPException(status_code=400, detail="invalid_grant")
+    issued_to, claims = _codes.pop(code)
+    now = int(time.time())
+    claims = {**claims, "aud": client_id or issued_to, "iat": now, "exp": now + 3600}
+    access_token = secrets.token_urlsafe(24)
+    _tokens[access_token] = claims
+    id_token = jwt.encode({"alg": "RS256", "kid": key.kid}, claims, key).decode()
+    return {"access_token": access_token, "token_type": "Bearer", "expires_in": 3600, "id_token": id_token}
+
+
+@app.get("/userinfo")
+def userinfo(request: Request):
+    claims = _tokens.get(request.headers.get("authorization", "").removeprefix("Bearer "))
+    if claims is None:
+        raise HTTPException(status_code=401)
+    return {k: claims[k] for k in ("sub", "email", "email_verified", "name")}
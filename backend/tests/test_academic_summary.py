@@ -0,0 +1,50 @@
+import uuid
+
+import pytest
+
+from services.academic_summary import parse_score, summarize
+
+
+@pytest.mark.parametrize("text, score", [
+    ("8.2", 8.2),
+    ("7.5 CGPA", 7.5),
+    ("7.5cgpa", 7.5),
+    (" 9 SGPA ", 9.0),
+    ("78%", 8.21),
+    ("76 %", 8.0),
+    ("95 percent", 10.0),
+    ("76", 8.0),  # bare numbers above 10 are percentages
+    ("100%", 10.0),
+])
+def test_parse_score_converts_to_cgpa(text, score):
+    assert parse_score(text) == score
+
+
+@pytest.mark.parametrize("text", [None, "", "AB", "8/10", "120", "12 CGPA", "150%", "7.5 CGPA, 80%"])
+def test_parse_score_skips_unconvertible_formats(text):
+    assert parse_score(text) is None
+
+
+def _marks(*scores):
+    return [
+        {"semester": f"sem{i}", "marks": score, "no_of_kt": "0"}
+        for i, score in enumerate(scores, start=1)
+    ]
+
+
+def test_summary_compares_percentages_and_cgpa_on_one_scale():
+    student_id = uuid.uuid4()
+
+    up = summarize(student_id, _marks("8.2", "78%"))
+    assert (up["latest_score"], up["average_score"], up["score_delta"], up["trend"]) == (8.21, 8.21, 0.01, 1)
+
+    down = summarize(student_id, _marks("82%", "8.0 CGPA"))
+    assert (down["latest_score"], down["average_score"], down["score_delta"], down["trend"]) == (8.0, 8.32, -0.63, -1)
+
+
+def test_summary_leaves_out_unparseable_marks():
+    summary = summarize(uuid.uuid4(), _marks("7.0", "AB", "9 CGPA"))
+
+    assert summary["average_score"] == 8.0
+    assert summary["score_delta"] == 2.0
+    assert summary["semesters_recorded"] == 3
@@ -0,0 +1,107 @@
+import asyncio
+import time
+from urllib.parse import urlencode
+
+import httpx
+import pytest
+from sqlmodel import Session, select
+
+import stub_idp
+from models import PersonalInfo
+from utils import oidc
+
+
+@pytest.fixture
+def idp(db, monkeypatch):
+    """Route every IdP call (discovery, JWKS, token) to tests/stub_idp.py
+    and start from an empty OIDC cache."""
+    monkeypatch.setattr(oidc.transport, "transport", httpx.ASGITransport(app=stub_idp.app))
+    for state in (oidc.provider._entries, oidc.provider._locks, oidc.provider._refreshing):
+        state.clear()
+    stub_idp.hits.clear()
+    return stub_idp
+
+
+def _age(name: str, seconds: float):
+    entry = oidc.provider._entries[name]
+    entry.fetched_at -= seconds
+
+
+async def _login(email: str) -> httpx.Response:
+    from app import app
+
+    async with httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=app), base_url="http://testserver"
+    ) as client, httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=stub_idp.app), base_url="http://idp.test"
+    ) as browser:
+        redirect = await client.get("/api/auth/login")
+        assert redirect.status_code == 302
+        authorize = f"{redirect.headers['location']}&{urlencode({'login_hint': email})}"
+        callback = await browser.get(authorize)
+        assert callback.status_code == 302
+        return await client.get(callback.headers["location"])
+
+
+def test_callback_verifies_id_token_locally(idp, db):
+    response = asyncio.run(_login("s1@atharva.edu"))
+
+    assert "AUTH_SUCCESS" in response.text
+    with Session(db.engine) as session:
+        user = session.exec(select(PersonalInfo).where(PersonalInfo.atharva_email == "s1@atharva.edu")).one()
+    assert user.student_id is not None
+    # The ID token came back with the token response and was checked against
+    # the cached JWKS: no userinfo round trip.
+    assert idp.hits["/userinfo"] == 0
+    assert idp.hits["/token"] == 1
+
+
+def test_discovery_and_jwks_are_cached_across_logins(idp):
+    for email in ("s1@atharva.edu", "s2@atharva.edu", "s3@atharva.edu"):
+        assert "AUTH_SUCCESS" in asyncio.run(_login(email)).text
+
+    assert idp.hits["/.well-known/openid-configuration"] == 1
+    assert idp.hits["/jwks"] == 1
+
+
+def test_unknown_kid_forces_jwks_refetch(idp):
+    assert "AUTH_SUCCESS" in asyncio.run(_login("s1@atharva.edu")).text
+    idp.rotate_key()
+
+    # A freshly fetched key set isn't reloaded more than once per
+    # JWKS_FORCE_REFRESH_INTERVAL, so a token with an unknown kid fails...
+    assert "AUTH_ERROR" in asyncio.run(_login("s2@atharva.edu")).text
+    assert idp.hits["/jwks"] == 1
+
+    # ...and once that interval has passed, the unknown kid triggers a reload.
+    _age("jwks", oidc.JWKS_FORCE_REFRESH_INTERVAL)
+    assert "AUTH_SUCCESS" in asyncio.run(_login("s2@atharva.edu")).text
+    assert idp.hits["/jwks"] == 2
+
+
+def test_discovery_refreshes_ahead_of_ttl_and_serves_stale(idp, monkeypatch):
+    discovery = "/.well-known/openid-configuration"
+
+    async def main():
+        first = await oidc.provider.metadata()
+        await oidc.provider.metadata()
+        assert idp.hits[discovery] == 1
+
+        # Past OIDC_REFRESH_AHEAD of the TTL: served from cache, reloaded
+        # in the background.
+        _age("discovery", oidc.provider.ttl * oidc.OIDC_REFRESH_AHEAD)
+        assert await oidc.provider.metadata() == first
+        await oidc.provider._refreshing["discovery"]
+        assert idp.hits[discovery] == 2
+        assert time.monotonic() - oidc.provider._entries["discovery"].fetched_at < 5
+
+        # Past the TTL with the IdP down: the stale document is served.
+        _age("discovery", oidc.provider.ttl)
+
+        def unreachable(request):
+            raise httpx.ConnectError("IdP down", request=request)
+
+        monkeypatch.setattr(oidc.transport, "transport", httpx.MockTransport(unreachable))
+        assert await oidc.provider.metadata() == first
+
+    asyncio.run(main())
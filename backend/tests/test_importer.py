@@ -0,0 +1,55 @@
+import asyncio
+import io
+
+import httpx
+from sqlmodel import Session, func, select
+
+from models import PersonalInfo, Student
+from services.importer import import_rows, read_rows
+from services.mentor_stats import stats_cache
+
+CSV = b"atharva_email,name,enrollment_no\nmixed.case@atharva.edu,Mixed Case,EN001\n"
+
+
+def _provisioned(database, email="Mixed.Case@atharva.edu"):
+    """A profile as OAuth provisioning stores it, in the IdP's casing."""
+    with Session(database.engine) as session:
+        student = Student()
+        session.add(student)
+        session.flush()
+        session.add(PersonalInfo(atharva_email=email, name="Mixed Case", student_id=student.id))
+        session.commit()
+
+
+def test_import_updates_profile_stored_in_mixed_case(db):
+    _provisioned(db)
+
+    with Session(db.engine) as session:
+        report = import_rows(session, read_rows(io.BytesIO(CSV), "students.csv")).report
+        infos = session.exec(select(PersonalInfo)).all()
+
+    assert (report.created, report.updated, report.failed) == (0, 1, 0)
+    assert len(infos) == 1
+    assert infos[0].enrollment_no == "EN001"
+
+
+def test_import_clears_mentor_stats(db):
+    from app import app
+    from security import get_admin
+
+    stats_cache.set("mentor", object())
+    app.dependency_overrides[get_admin] = lambda: None
+
+    async def upload():
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://testserver") as client:
+            return await client.post("/api/v1/admin/import", files={"file": ("students.csv", CSV, "text/csv")})
+
+    try:
+        response = asyncio.run(upload())
+    finally:
+        app.dependency_overrides.pop(get_admin)
+
+    assert response.json()["created"] == 1
+    assert stats_cache.get("mentor") is None
+    with Session(db.engine) as session:
+        assert session.exec(select(func.count()).select_from(PersonalInfo)).one() == 1
@@ -0,0 +1,54 @@
+import asyncio
+import uuid
+
+from sqlmodel import Session
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from models import Mark, Mentor, Student
+from models.mark import Sem
+from services.academic_summary import refresh_summaries
+from services.mentor_stats import mentor_stats
+
+# student -> [(semester, marks, no_of_kt), ...]
+ROSTER = [
+    [(Sem.sem1, "8.0", "0"), (Sem.sem2, "76%", "00")],
+    [(Sem.sem1, "80%", "1 KT"), (Sem.sem2, "7.0 CGPA", "0 KT")],
+    [(Sem.sem1, "9.5", "none"), (Sem.sem2, "95", "2")],
+    [(Sem.sem1, "AB", " "), (Sem.sem2, "6", "1")],
+]
+
+
+def _seed(database):
+    mentor = Mentor(email="mentor@atharva.edu", password="x", semester="sem2", mentor_name="Mentor")
+    with Session(database.engine) as session:
+        session.add(mentor)
+        marks_by_student = {}
+        for rows in ROSTER:
+            student = Student(id=uuid.uuid4(), mentor_id=mentor.id)
+            session.add(student)
+            marks_by_student[student.id] = [
+                Mark(student_id=student.id, semester=sem, marks=marks, no_of_kt=kts, kt_subject="")
+                for sem, marks, kts in rows
+            ]
+            session.add_all(marks_by_student[student.id])
+        session.flush()
+        refresh_summaries(session, marks_by_student)
+        session.commit()
+        return mentor.id
+
+
+def test_kt_counts_and_scores_use_the_parsed_values(db):
+    mentor_id = _seed(db)
+
+    async def main():
+        async with AsyncSession(db.async_engine) as session:
+            return await mentor_stats(session, mentor_id)
+
+    stats = asyncio.run(main())
+
+    assert {s.semester: (s.students, s.with_kt) for s in stats.semesters} == {"sem1": (4, 1), "sem2": (4, 2)}
+    # Latest semester is sem2 for everyone: the same two students.
+    assert stats.with_active_kt == 2
+    # Averages 8.0, 7.71, 9.75 and 6.0, all on the CGPA scale.
+    assert stats.average_score == 7.87
+    assert stats.trend == {"up": 1, "flat": 1, "down": 1}
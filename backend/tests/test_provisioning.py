@@ -0,0 +1,62 @@
+import asyncio
+
+from sqlmodel import Session, func, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from models import PersonalInfo, Student
+from services.provisioning import provision_student
+
+EMAIL = "first.login@atharva.edu"
+
+
+async def _login(database, email=EMAIL, name="First Login"):
+    async with AsyncSession(database.async_engine, expire_on_commit=False) as session:
+        return await provision_student(session, email, name)
+
+
+def _counts(database):
+    with Session(database.engine) as session:
+        infos = session.exec(
+            select(func.count()).select_from(PersonalInfo).where(PersonalInfo.atharva_email == EMAIL)
+        ).one()
+        students = session.exec(select(func.count()).select_from(Student)).one()
+        orphans = session.exec(
+            select(func.count()).select_from(Student)
+            .where(~Student.id.in_(select(PersonalInfo.student_id).where(PersonalInfo.student_id.is_not(None))))
+        ).one()
+    return infos, students, orphans
+
+
+def test_parallel_first_logins_create_one_linked_pair(db):
+    async def main():
+        return await asyncio.gather(*(_login(db) for _ in range(20)))
+
+    users = asyncio.run(main())
+
+    assert len({user.id for user in users}) == 1
+    assert len({user.student_id for user in users}) == 1
+    assert users[0].student_id is not None
+    assert _counts(db) == (1, 1, 0)
+
+
+def test_returning_login_reuses_rows(db):
+    first = asyncio.run(_login(db))
+    again = asyncio.run(_login(db, name="Renamed"))
+
+    assert (again.id, again.student_id, again.name) == (first.id, first.student_id, "First Login")
+    assert _counts(db) == (1, 1, 0)
+
+
+def test_first_login_links_imported_profile(db):
+    with Session(db.engine) as session:
+        session.add(PersonalInfo(name="Imported", atharva_email=EMAIL, enrollment_no="EN1"))
+        session.commit()
+
+    async def main():
+        return await asyncio.gather(*(_login(db) for _ in range(5)))
+
+    users = asyncio.run(main())
+
+    assert len({(user.id, user.student_id) for user in users}) == 1
+    assert users[0].name == "Imported"
+    assert _counts(db) == (1, 1, 0)
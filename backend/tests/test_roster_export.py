@@ -0,0 +1,25 @@
+import asyncio
+import os
+
+from openpyxl import load_workbook
+
+from services import roster_export
+from services.roster_export import COLUMNS, xlsx_file
+
+
+async def _rows(count):
+    for i in range(count):
+        yield [f"student{i}@atharva.edu", f"Student {i}"]
+
+
+def test_xlsx_file_writes_every_row_across_batches(monkeypatch):
+    monkeypatch.setattr(roster_export, "XLSX_BATCH_ROWS", 4)
+
+    path = asyncio.run(xlsx_file(_rows(10)))
+    try:
+        rows = list(load_workbook(path, read_only=True)["Roster"].values)
+    finally:
+        os.unlink(path)
+
+    assert list(rows[0]) == COLUMNS
+    assert [row[:2] for row in rows[1:]] == [(f"student{i}@atharva.edu", f"Student {i}") for i in range(10)]
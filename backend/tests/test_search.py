@@ -0,0 +1,38 @@
+import random
+
+from services.search import SEARCH_MIN_SCORE, NgramSearch, trigrams
+
+
+def _index(documents):
+    index = NgramSearch()
+    index._loaded = True
+    for id, text in documents.items():
+        index.document_changed(id, text)
+    return index
+
+
+def _brute_force(documents, q, top):
+    query = trigrams(q)
+    scored = [(len(query & trigrams(text)) / len(query), id) for id, text in documents.items()]
+    return sorted((item for item in scored if item[0] >= SEARCH_MIN_SCORE), reverse=True)[:top]
+
+
+def test_best_match_among_many_common_candidates_is_ranked_first():
+    # Every trigram of the query is shared by thousands of documents; only
+    # one has all of them.
+    documents = {i: f"rohan {i}" for i in range(3000)}
+    documents.update({i: f"patil {i}" for i in range(3000, 6000)})
+    documents[6000] = "rohan patil"
+
+    assert _index(documents).rank("rohan patil", 1) == [(6000, 1.0)]
+
+
+def test_rank_matches_scoring_every_document():
+    rng = random.Random(0)
+    words = ["aarav", "ananya", "patil", "shinde", "joshi", "cricket", "chess", "dbms", "maths"]
+    documents = {i: " ".join(rng.sample(words, 3)) + f" en{i:05}" for i in range(3000)}
+    index = _index(documents)
+
+    for q in ["patil", "anan", "joshi cricket", "en0123", "dbms maths aarav", "xyz"]:
+        assert [score for _, score in index.rank(q, 20)] == [score for score, _ in _brute_force(documents, q, 20)], q
+        assert {id for id, _ in index.rank(q, 10_000)} == {id for _, id in _brute_force(documents, q, 10_000)}, q
@@ -0,0 +1,23 @@
+import io
+
+import pytest
+
+from utils.storage import LocalStorage, StorageBackend
+
+
+def test_backend_without_save_fails_at_construction():
+    class Incomplete(StorageBackend):
+        pass
+
+    with pytest.raises(TypeError):
+        Incomplete()
+
+
+def test_local_storage_writes_file_and_returns_url(tmp_path):
+    storage = LocalStorage(root=str(tmp_path), base_url="/media/")
+
+    url = storage.save(io.BytesIO(b"image"), "students/abc", "image/webp")
+
+    assert url == "/media/students/abc.webp"
+    assert (tmp_path / "students" / "abc.webp").read_bytes() == b"image"
+    assert not (tmp_path / "students" / "abc.webp.part").exists()
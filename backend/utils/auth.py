@@ -3,11 +3,11 @@ from fastapi import APIRouter, Request, Depends
 from authlib.integrations.starlette_client import OAuth
 from starlette.config import Config
 from starlette.responses import JSONResponse, HTMLResponse
-from sqlmodel import Session, select
-from models.personal_info import PersonalInfo
-from models.student import Student
-from database import get_session
+from sqlmodel.ext.asyncio.session import AsyncSession
+from database import get_async_session
 from security import create_token
+from services.provisioning import provision_student
+from utils.oidc import CachedOIDCApp, OIDC_DISCOVERY_URL, OIDC_HTTP_TIMEOUT, transport
 
 import os
 
@@ -19,9 +19,13 @@ oauth.register(
     name='google',
     client_id=config('GOOGLE_CLIENT_ID'),
     client_secret=config('GOOGLE_CLIENT_SECRET'),
-    server_metadata_url='https://accounts.google.com/.well-known/openid-configuration',
-    api_base_url='https://www.googleapis.com/oauth2/v2/',
-    client_kwargs={'scope': 'openid email profile'},
+    server_metadata_url=OIDC_DISCOVERY_URL,
+    client_cls=CachedOIDCApp,
+    client_kwargs={
+        'scope': 'openid email profile',
+        'transport': transport,
+        'timeout': OIDC_HTTP_TIMEOUT,
+    },
 )
 
 
@@ -37,36 +41,21 @@ async def login(request: Request):
 @router.get('/auth/callback')
 async def auth_callback(
     request: Request,
-    session: Session = Depends(get_session)
+    session: AsyncSession = Depends(get_async_session)
 ):
     try:
+        # The ID token is verified locally against the cached JWKS; userinfo
+        # is only fetched if the IdP didn't return one.
         token = await oauth.google.authorize_access_token(request)
-        user_info = await oauth.google.get('userinfo', token=token)
-        user_info = user_info.json()
+        user_info = token.get('userinfo') or await oauth.google.userinfo(token=token)
 
 
         email = user_info.get('email')
         name = user_info.get('name')
+        if not email:
+            raise ValueError("Google account has no email")
 
-        statement = select(PersonalInfo).where(PersonalInfo.atharva_email == email)
-        user = session.exec(statement).first()
-
-        if not user:
-            user = PersonalInfo(atharva_email=email, name=name)
-            session.add(user)
-            session.commit()
-            session.refresh(user)
-
-        if not user.student_id:
-            student = Student()
-            session.add(student)
-            session.commit()
-            session.refresh(student)
-
-            user.student_id = student.id
-            session.add(user)
-            session.commit()
-            session.refresh(user)
+        user = await provision_student(session, email, name)
 
         jwt_token = create_token(str(user.id))
 
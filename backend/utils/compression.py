@@ -0,0 +1,125 @@
+"""Negotiated response compression: brotli when installed and accepted,
+else gzip; skipped below COMPRESS_MIN_SIZE bytes and for content types that
+are already compressed. Streaming bodies are flushed chunk by chunk so
+NDJSON/CSV consumers still see rows as they are produced."""
+import os
+import re
+import zlib
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+try:
+    import brotli
+except ImportError:  # optional; gzip only without it
+    brotli = None
+
+COMPRESS_MIN_SIZE = int(os.getenv("COMPRESS_MIN_SIZE", 1024))
+GZIP_LEVEL = int(os.getenv("GZIP_LEVEL", 6))
+BROTLI_QUALITY = int(os.getenv("BROTLI_QUALITY", 5))
+
+COMPRESSIBLE = ("text/", "application/json", "application/x-ndjson", "application/javascript", "application/xml")
+
+
+class _Gzip:
+    encoding = "gzip"
+
+    def __init__(self):
+        self._z = zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+    def chunk(self, data: bytes) -> bytes:
+        return self._z.compress(data) + self._z.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self, data: bytes = b"") -> bytes:
+        return self._z.compress(data) + self._z.flush()
+
+
+class _Brotli:
+    encoding = "br"
+
+    def __init__(self):
+        self._c = brotli.Compressor(quality=BROTLI_QUALITY)
+
+    def chunk(self, data: bytes) -> bytes:
+        return self._c.process(data) + self._c.flush()
+
+    def finish(self, data: bytes = b"") -> bytes:
+        return self._c.process(data) + self._c.finish()
+
+
+def negotiate(accept_encoding: str):
+    """Pick a compressor from Accept-Encoding, honouring q=0."""
+    accepted = {}
+    for part in accept_encoding.lower().split(","):
+        name, _, params = part.strip().partition(";")
+        match = re.search(r"q=([\d.]+)", params)
+        accepted[name.strip()] = float(match.group(1)) if match else 1.0
+    if brotli is not None and accepted.get("br", 0) > 0:
+        return _Brotli
+    if accepted.get("gzip", 0) > 0:
+        return _Gzip
+    return None
+
+
+class CompressionMiddleware:
+    def __init__(self, app: ASGIApp, minimum_size: int = COMPRESS_MIN_SIZE):
+        self.app = app
+        self.minimum_size = minimum_size
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+        compressor_cls = negotiate(Headers(scope=scope).get("accept-encoding", ""))
+        if compressor_cls is None:
+            return await self.app(scope, receive, send)
+
+        start = None
+        pending = b""
+        compressor = None
+        compressible = False
+
+        async def send_compressed(message: Message):
+            nonlocal start, pending, compressor, compressible
+            if message["type"] == "http.response.start":
+                # Held back until enough body has arrived to decide.
+                start = message
+                headers = Headers(raw=message["headers"])
+                compressible = (
+                    "content-encoding" not in headers
+                    and headers.get("content-type", "").startswith(COMPRESSIBLE)
+                )
+                return
+            if message["type"] != "http.response.body":
+                return await send(message)
+
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+            if start is None:
+                if compressor is not None:
+                    body = compressor.chunk(body) if more_body else compressor.finish(body)
+                    message = {**message, "body": body}
+                return await send(message)
+
+            # Upstream middleware may re-chunk even small bodies, so buffer
+            # up to the threshold before choosing.
+            pending += body
+            if compressible and more_body and len(pending) < self.minimum_size:
+                return
+            headers = MutableHeaders(raw=start["headers"])
+            if compressible:
+                headers.add_vary_header("Accept-Encoding")
+                if len(pending) >= self.minimum_size:
+                    compressor = compressor_cls()
+                    headers["Content-Encoding"] = compressor.encoding
+                    if more_body:
+                        del headers["Content-Length"]
+                        pending = compressor.chunk(pending)
+                    else:
+                        pending = compressor.finish(pending)
+                        headers["Content-Length"] = str(len(pending))
+            await send(start)
+            start = None
+            await send({**message, "body": pending})
+            pending = b""
+
+        await self.app(scope, receive, send_compressed)
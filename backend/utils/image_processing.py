@@ -0,0 +1,56 @@
+import io
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict
+
+from PIL import Image, ImageOps
+
+IMAGE_WORKERS = int(os.getenv("IMAGE_WORKERS", 2))
+IMAGE_FORMAT = os.getenv("IMAGE_FORMAT", "webp")
+IMAGE_QUALITY = int(os.getenv("IMAGE_QUALITY", 80))
+
+# Largest first: each variant is downscaled from the previous one.
+VARIANTS = {
+    "photo": 1024,
+    "photo_medium": 320,
+    "photo_thumb": 96,
+}
+
+CONTENT_TYPES = {"webp": "image/webp", "jpeg": "image/jpeg"}
+
+Image.MAX_IMAGE_PIXELS = int(os.getenv("IMAGE_MAX_PIXELS", 50_000_000))
+
+_pool = None
+
+
+def get_image_pool() -> ProcessPoolExecutor:
+    # Created lazily so importing the app doesn't start workers. By then the
+    # server runs bcrypt, upload and anyio threads, and a fork could copy a
+    # lock one of them holds; forkserver (spawn where unavailable) starts
+    # workers from a clean process, which only needs this module's imports.
+    global _pool
+    if _pool is None:
+        method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+        _pool = ProcessPoolExecutor(max_workers=IMAGE_WORKERS, mp_context=multiprocessing.get_context(method))
+    return _pool
+
+
+def render_variants(data: bytes) -> Dict[str, bytes]:
+    """Decode once, apply EXIF orientation and re-encode every variant without
+    metadata. Runs in a worker process."""
+    img = Image.open(io.BytesIO(data))
+    largest = max(VARIANTS.values())
+    # Lets the JPEG decoder downscale by a power of two while decoding.
+    img.draft("RGB", (largest, largest))
+    img = ImageOps.exif_transpose(img)
+    keep_alpha = IMAGE_FORMAT == "webp" and img.mode in ("RGBA", "LA", "P")
+    img = img.convert("RGBA" if keep_alpha else "RGB")
+
+    rendered = {}
+    for name, size in VARIANTS.items():
+        img.thumbnail((size, size), Image.LANCZOS)
+        out = io.BytesIO()
+        img.save(out, format=IMAGE_FORMAT.upper(), quality=IMAGE_QUALITY, optimize=True)
+        rendered[name] = out.getvalue()
+    return rendered
@@ -1,31 +1,110 @@
+import asyncio
+import io
 import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict
 from fastapi import UploadFile, HTTPException, status
-from cloudinary.uploader import upload
-import cloudinary
 from dotenv import load_dotenv
 
+from utils.storage import get_storage, UPLOAD_CHUNK_SIZE
+from utils.image_processing import get_image_pool, render_variants, CONTENT_TYPES, IMAGE_FORMAT
+
 load_dotenv()
 
-cloudinary.config(
-    cloud_name=os.getenv("CLOUDINARY_CLOUD_NAME"),
-    api_key=os.getenv("CLOUDINARY_API_KEY"),
-    api_secret=os.getenv("CLOUDINARY_API_SECRET"),
-    secure=True
-)
+MAX_UPLOAD_BYTES = int(os.getenv("MAX_UPLOAD_BYTES", 12 * 1024 * 1024))
+UPLOAD_WORKERS = int(os.getenv("UPLOAD_WORKERS", 4))
+
+# Magic-byte prefixes; the client's Content-Type alone isn't trusted.
+SIGNATURES = {
+    "image/jpeg": (b"\xff\xd8\xff",),
+    "image/png": (b"\x89PNG\r\n\x1a\n",),
+    "image/webp": (b"RIFF",),
+}
+
+_upload_executor = ThreadPoolExecutor(max_workers=UPLOAD_WORKERS, thread_name_prefix="upload")
+_pending_uploads = 0
+
+
+def upload_queue_depth() -> int:
+    return _pending_uploads
+
+
+def _sniff(head: bytes):
+    for content_type, prefixes in SIGNATURES.items():
+        if any(head.startswith(prefix) for prefix in prefixes):
+            if content_type == "image/webp" and head[8:12] != b"WEBP":
+                continue
+            return content_type
+    return None
+
+
+async def validate_image(image: UploadFile) -> str:
+    """Check declared type, magic bytes and size, reading in chunks; returns
+    the detected content type with the file rewound."""
+    if image.content_type not in SIGNATURES:
+        raise HTTPException(
+            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            detail=f"Unsupported image type '{image.content_type}'"
+        )
+
+    head = await image.read(UPLOAD_CHUNK_SIZE)
+    content_type = _sniff(head)
+    if content_type is None:
+        raise HTTPException(
+            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            detail="File content is not a supported image"
+        )
 
-async def upload_image(image: UploadFile, id: str) -> str:
+    size = len(head)
+    while size <= MAX_UPLOAD_BYTES:
+        chunk = await image.read(UPLOAD_CHUNK_SIZE)
+        if not chunk:
+            break
+        size += len(chunk)
+    if size > MAX_UPLOAD_BYTES:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"Image exceeds {MAX_UPLOAD_BYTES} bytes"
+        )
+
+    await image.seek(0)
+    return content_type
+
+
+async def run_upload(fn, *args):
+    global _pending_uploads
+    _pending_uploads += 1
     try:
-        public_id = f"users/{id}"
-        
-        upload_result = upload(
-            image.file,
-            public_id=public_id,
-            overwrite=True
+        return await asyncio.get_running_loop().run_in_executor(_upload_executor, fn, *args)
+    finally:
+        _pending_uploads -= 1
+
+
+async def upload_profile_photo(image: UploadFile, id: str) -> Dict[str, str]:
+    """Resize the photo into VARIANTS in the image process pool and store each
+    one; returns variant name -> URL."""
+    await validate_image(image)
+    data = await image.read()
+    try:
+        rendered = await asyncio.get_running_loop().run_in_executor(
+            get_image_pool(), render_variants, data
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"Could not process image: {str(e)}"
         )
-        file_url = upload_result.get('secure_url')
-        return file_url
+
+    content_type = CONTENT_TYPES[IMAGE_FORMAT]
+    storage = get_storage()
+    try:
+        urls = await asyncio.gather(*(
+            run_upload(storage.save, io.BytesIO(body), f"users/{id}_{name}", content_type)
+            for name, body in rendered.items()
+        ))
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Error uploading image: {str(e)}"
         )
+    return dict(zip(rendered, urls))
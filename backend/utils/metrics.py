@@ -0,0 +1,218 @@
+"""Prometheus text-format metrics without a client library.
+
+- MetricsMiddleware: request latency histogram and in-flight gauge per
+  route template (``/api/v1/student/``, not the raw URL, so label
+  cardinality stays bounded).
+- TimedQueuePool / TimedAsyncQueuePool: connection checkout wait per engine.
+- Collectors read pool utilization, executor queue depths and cache hit
+  ratios at scrape time, so nothing is sampled between scrapes.
+
+``render()`` produces the /metrics body.
+"""
+import bisect
+import os
+import threading
+import time
+from collections import defaultdict
+from typing import Callable, Dict, Iterable, List, Tuple
+
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+from starlette.routing import Match
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+# Bearer token /metrics requires when set; unset leaves it open (keep it
+# on an internal network then).
+METRICS_TOKEN = os.getenv("METRICS_TOKEN")
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+CHECKOUT_BUCKETS = (0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 30.0)
+
+Labels = Tuple[Tuple[str, str], ...]
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format(name: str, labels: Labels, value) -> str:
+    if labels:
+        name += "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in labels) + "}"
+    return f"{name} {value:g}" if isinstance(value, float) else f"{name} {value}"
+
+
+class Histogram:
+    def __init__(self, name: str, help: str, buckets: Iterable[float]):
+        self.name, self.help = name, help
+        self.buckets = tuple(buckets)
+        # labels -> [count per bucket..., +Inf count, sum]
+        self._series: Dict[Labels, List[float]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels):
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [0] * (len(self.buckets) + 1) + [0.0]
+            series[bisect.bisect_left(self.buckets, value)] += 1
+            series[-1] += value
+
+    def samples(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            series = {key: list(values) for key, values in self._series.items()}
+        for labels, values in sorted(series.items()):
+            cumulative = 0
+            for bound, count in zip((*self.buckets, "+Inf"), values):
+                cumulative += count
+                lines.append(_format(f"{self.name}_bucket", (*labels, ("le", bound)), cumulative))
+            lines.append(_format(f"{self.name}_sum", labels, float(values[-1])))
+            lines.append(_format(f"{self.name}_count", labels, cumulative))
+        return lines
+
+
+class Gauge:
+    """Up/down counter per label set (in-flight requests)."""
+
+    def __init__(self, name: str, help: str):
+        self.name, self.help = name, help
+        self._values: Dict[Labels, int] = defaultdict(int)
+        self._lock = threading.Lock()
+
+    def add(self, amount: int, **labels):
+        with self._lock:
+            self._values[tuple(sorted(labels.items()))] += amount
+
+    def samples(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} gauge"]
+        with self._lock:
+            lines += [_format(self.name, labels, value) for labels, value in sorted(self._values.items())]
+        return lines
+
+
+REQUEST_LATENCY = Histogram(
+    "http_request_duration_seconds", "Time from request start to the last response byte.", LATENCY_BUCKETS)
+IN_FLIGHT = Gauge("http_requests_in_flight", "Requests currently being handled.")
+POOL_CHECKOUT = Histogram(
+    "db_pool_checkout_seconds", "Time to get a connection from the pool, waiting included.", CHECKOUT_BUCKETS)
+
+
+class _TimedCheckout:
+    def connect(self):
+        start = time.perf_counter()
+        try:
+            return super().connect()
+        finally:
+            POOL_CHECKOUT.observe(time.perf_counter() - start, engine=self.logging_name or "default")
+
+
+class TimedQueuePool(_TimedCheckout, QueuePool):
+    pass
+
+
+class TimedAsyncQueuePool(_TimedCheckout, AsyncAdaptedQueuePool):
+    pass
+
+
+# (name, type, help) -> callable returning [(labels, value), ...]
+_collectors: List[Tuple[str, str, str, Callable[[], Iterable[Tuple[dict, float]]]]] = []
+
+
+def register(name: str, type: str, help: str, collect: Callable[[], Iterable[Tuple[dict, float]]]):
+    """Add a metric whose samples are computed at scrape time."""
+    _collectors.append((name, type, help, collect))
+
+
+def register_pool(name: str, engine):
+    """Pool size/checked-out/overflow/utilization for ``engine``; pools
+    without sizing (NullPool, StaticPool) are skipped."""
+    def collector(stat):
+        def collect():
+            pool = engine.pool  # read per scrape, dispose() swaps it
+            if not isinstance(pool, QueuePool):
+                return []
+            checked_out = pool.checkedout()
+            values = {
+                "size": pool.size(),
+                "checked_out": checked_out,
+                "overflow": max(pool.overflow(), 0),
+                "utilization": checked_out / (pool.size() + max(pool._max_overflow, 0)),
+            }
+            return [({"engine": name}, values[stat])]
+        return collect
+
+    register("db_pool_size", "gauge", "Configured pool size.", collector("size"))
+    register("db_pool_checked_out", "gauge", "Connections currently checked out.", collector("checked_out"))
+    register("db_pool_overflow", "gauge", "Connections open beyond the pool size.", collector("overflow"))
+    register("db_pool_utilization", "gauge",
+             "Checked-out connections over pool size plus max overflow.", collector("utilization"))
+
+
+def register_executor(name: str, queue_depth: Callable[[], int], workers: int):
+    register("executor_pending", "gauge", "Tasks submitted to the executor and not yet finished.",
+             lambda: [({"executor": name}, queue_depth())])
+    register("executor_workers", "gauge", "Executor thread count.",
+             lambda: [({"executor": name}, workers)])
+
+
+def register_cache(name: str, cache):
+    """Hits, misses, hit ratio and size of a utils.cache.TTLCache."""
+    labels = {"cache": name}
+    register("cache_hits_total", "counter", "Cache lookups that found a live entry.",
+             lambda: [(labels, cache.hits)])
+    register("cache_misses_total", "counter", "Cache lookups that missed or found an expired entry.",
+             lambda: [(labels, cache.misses)])
+    register("cache_hit_ratio", "gauge", "Hits over lookups since start.",
+             lambda: [(labels, cache.hits / lookups)] if (lookups := cache.hits + cache.misses) else [])
+    register("cache_entries", "gauge", "Entries currently held.", lambda: [(labels, len(cache))])
+
+
+def render() -> str:
+    lines = [*REQUEST_LATENCY.samples(), *IN_FLIGHT.samples(), *POOL_CHECKOUT.samples()]
+    by_name = defaultdict(list)
+    for name, type, help, collect in _collectors:
+        by_name[(name, type, help)].extend(collect())
+    for (name, type, help), samples in by_name.items():
+        lines += [f"# HELP {name} {help}", f"# TYPE {name} {type}"]
+        lines += [_format(name, tuple(sorted(labels.items())), value) for labels, value in samples]
+    return "\n".join(lines) + "\n"
+
+
+def _route(scope: Scope) -> str:
+    partial = None
+    for route in scope["app"].router.routes:
+        match, _ = route.matches(scope)
+        if match == Match.FULL:
+            return route.path
+        if match == Match.PARTIAL and partial is None:
+            partial = route.path  # path matched, method didn't (405)
+    return partial or "unmatched"
+
+
+class MetricsMiddleware:
+    """Outermost middleware, so latency covers every other layer."""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        route, method = _route(scope), scope["method"]
+        status = 500
+        start = time.perf_counter()
+
+        async def send_with_status(message: Message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        IN_FLIGHT.add(1, method=method, route=route)
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            IN_FLIGHT.add(-1, method=method, route=route)
+            REQUEST_LATENCY.observe(time.perf_counter() - start, method=method, route=route, status=status)
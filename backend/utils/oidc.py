@@ -0,0 +1,141 @@
+"""OpenID Connect plumbing for the Google login.
+
+- One pooled httpx transport for every IdP call, so the discovery, token and
+  JWKS requests reuse keep-alive connections instead of a fresh TLS
+  handshake per call.
+- Discovery metadata and JWKS cached for OIDC_METADATA_TTL, refreshed in
+  the background once they are OIDC_REFRESH_AHEAD of the way through it, and
+  served stale if the IdP can't be reached.
+- CachedOIDCApp plugs both into Authlib, whose ID-token check then runs
+  against the cached keys, so the callback needs no userinfo round trip.
+
+Point OIDC_DISCOVERY_URL at tests/stub_idp.py to log in without Google.
+"""
+import asyncio
+import logging
+import os
+import time
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+import httpx
+from authlib.integrations.starlette_client import StarletteOAuth2App
+
+OIDC_DISCOVERY_URL = os.getenv(
+    "OIDC_DISCOVERY_URL", "https://accounts.google.com/.well-known/openid-configuration"
+)
+OIDC_METADATA_TTL = float(os.getenv("OIDC_METADATA_TTL", 3600))
+OIDC_REFRESH_AHEAD = float(os.getenv("OIDC_REFRESH_AHEAD", 0.8))
+OIDC_HTTP_TIMEOUT = float(os.getenv("OIDC_HTTP_TIMEOUT", 10))
+OIDC_HTTP_MAX_CONNECTIONS = int(os.getenv("OIDC_HTTP_MAX_CONNECTIONS", 20))
+# Minimum gap between forced JWKS reloads on an unknown signing key.
+JWKS_FORCE_REFRESH_INTERVAL = 30
+
+logger = logging.getLogger("app.oidc")
+
+
+class SharedTransport(httpx.AsyncBaseTransport):
+    """Lets short-lived clients (Authlib opens one per call) share a pool.
+    Closing a client leaves the pool open; close_http() shuts it down."""
+
+    def __init__(self, transport: httpx.AsyncBaseTransport):
+        self.transport = transport
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        return await self.transport.handle_async_request(request)
+
+    async def aclose(self):
+        pass
+
+
+_pool = httpx.AsyncHTTPTransport(
+    limits=httpx.Limits(
+        max_connections=OIDC_HTTP_MAX_CONNECTIONS,
+        max_keepalive_connections=OIDC_HTTP_MAX_CONNECTIONS,
+    ),
+    retries=1,
+)
+transport = SharedTransport(_pool)
+http_client = httpx.AsyncClient(transport=transport, timeout=OIDC_HTTP_TIMEOUT)
+
+
+async def close_http():
+    await http_client.aclose()
+    await _pool.aclose()
+
+
+@dataclass
+class _Entry:
+    value: Dict[str, Any]
+    fetched_at: float
+
+
+class OIDCProvider:
+    """TTL cache with background refresh for discovery and JWKS documents."""
+
+    def __init__(self, discovery_url: str, ttl: float = OIDC_METADATA_TTL):
+        self.discovery_url = discovery_url
+        self.ttl = ttl
+        self._entries: Dict[str, _Entry] = {}
+        self._locks: Dict[str, asyncio.Lock] = {}
+        self._refreshing: Dict[str, asyncio.Task] = {}
+
+    async def _get_json(self, url: str) -> Dict[str, Any]:
+        response = await http_client.get(url)
+        response.raise_for_status()
+        return response.json()
+
+    async def _load(self, name: str, fetch: Callable[[], Awaitable[Dict]], stale: Optional[_Entry]):
+        lock = self._locks.setdefault(name, asyncio.Lock())
+        async with lock:
+            entry = self._entries.get(name)
+            if entry is not stale:  # another caller already reloaded it
+                return entry.value
+            try:
+                value = await fetch()
+            except (httpx.HTTPError, ValueError):
+                if stale is None:
+                    raise
+                logger.warning("oidc_refresh_failed document=%s serving_stale_age=%.0fs",
+                               name, time.monotonic() - stale.fetched_at, exc_info=True)
+                return stale.value
+            self._entries[name] = _Entry(value, time.monotonic())
+            return value
+
+    def _refresh_in_background(self, name: str, fetch, entry: _Entry):
+        task = self._refreshing.get(name)
+        if task is None or task.done():
+            self._refreshing[name] = asyncio.create_task(self._load(name, fetch, entry))
+
+    async def _cached(self, name: str, fetch, force: bool = False) -> Dict[str, Any]:
+        entry = self._entries.get(name)
+        if entry is None:
+            return await self._load(name, fetch, None)
+        age = time.monotonic() - entry.fetched_at
+        if (force and age >= JWKS_FORCE_REFRESH_INTERVAL) or age >= self.ttl:
+            return await self._load(name, fetch, entry)
+        if age >= self.ttl * OIDC_REFRESH_AHEAD:
+            self._refresh_in_background(name, fetch, entry)
+        return entry.value
+
+    async def metadata(self) -> Dict[str, Any]:
+        return await self._cached("discovery", lambda: self._get_json(self.discovery_url))
+
+    async def jwks(self, force: bool = False) -> Dict[str, Any]:
+        async def fetch():
+            return await self._get_json((await self.metadata())["jwks_uri"])
+        return await self._cached("jwks", fetch, force)
+
+
+provider = OIDCProvider(OIDC_DISCOVERY_URL)
+
+
+class CachedOIDCApp(StarletteOAuth2App):
+    """Authlib app reading discovery/JWKS through ``provider``."""
+
+    async def load_server_metadata(self):
+        self.server_metadata.update(await provider.metadata())
+        return self.server_metadata
+
+    async def fetch_jwk_set(self, force=False):
+        return await provider.jwks(force)
@@ -0,0 +1,67 @@
+import os
+from typing import Optional
+
+from utils.cache import TTLCache
+
+PROFILE_CACHE_SIZE = int(os.getenv("PROFILE_CACHE_SIZE", 5_000))
+PROFILE_CACHE_TTL = float(os.getenv("PROFILE_CACHE_TTL", 300))
+# e.g. redis://localhost:6379/0 to share entries across workers.
+PROFILE_CACHE_URL = os.getenv("PROFILE_CACHE_URL")
+
+
+class LocalProfileCache:
+    def __init__(self):
+        self.cache = TTLCache(PROFILE_CACHE_SIZE, PROFILE_CACHE_TTL)
+
+    async def get(self, key: str) -> Optional[bytes]:
+        return self.cache.get(key)
+
+    async def set(self, key: str, value: bytes):
+        self.cache.set(key, value)
+
+    async def delete(self, key: str):
+        self.cache.delete(key)
+
+
+class RedisProfileCache:
+    def __init__(self, url: str):
+        try:
+            from redis import asyncio as aioredis
+        except ImportError:
+            raise RuntimeError("PROFILE_CACHE_URL is set but the 'redis' package is not installed")
+        self.client = aioredis.from_url(url)
+
+    async def get(self, key: str) -> Optional[bytes]:
+        return await self.client.get(key)
+
+    async def set(self, key: str, value: bytes):
+        await self.client.set(key, value, ex=int(PROFILE_CACHE_TTL))
+
+    async def delete(self, key: str):
+        await self.client.delete(key)
+
+
+profile_cache = RedisProfileCache(PROFILE_CACHE_URL) if PROFILE_CACHE_URL else LocalProfileCache()
+
+
+# Entries are keyed by PersonalInfo.version, which every profile write bumps,
+# so a stale body can never be served even if a delete is missed.
+def profile_key(personal_info_id, version: int) -> str:
+    return f"profile:{personal_info_id}:{version}"
+
+
+def profile_etag(personal_info_id, version: int, variant: str = "") -> str:
+    # variant tells sparse-fieldset representations of one version apart.
+    suffix = f"-{variant}" if variant else ""
+    return f'"{personal_info_id}-{version}{suffix}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    candidates = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+    return "*" in candidates or etag in candidates
+
+
+async def invalidate_profile(personal_info_id, version: int):
+    await profile_cache.delete(profile_key(personal_info_id, version))
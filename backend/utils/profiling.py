@@ -0,0 +1,216 @@
+"""Opt-in sampling profiler for single requests.
+
+A request is profiled when it sends ``X-Profile: <PROFILE_TOKEN>`` or is
+picked at PROFILE_SAMPLE_RATE. While it runs, a sampler thread records
+every busy thread's Python stack each PROFILE_INTERVAL_MS, and the
+request's queries are logged with their start offsets (utils.query_stats).
+The result is written to PROFILE_DIR, where every worker on the host can
+read it, and its id is returned in X-Profile-Id; admins fetch it from
+/api/v1/admin/profiles as speedscope JSON, collapsed stacks (flamegraph.pl,
+speedscope) or the SQL timeline.
+
+Requests that aren't profiled pay for one header lookup and, with a
+sample rate set, one random() call. Samples cover the whole process, so
+requests running concurrently with the profiled one show up too.
+"""
+import hmac
+import json
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+import uuid
+from collections import Counter
+from typing import Dict, List, Optional
+
+from fastapi.concurrency import run_in_threadpool
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from utils.query_stats import current_stats
+
+PROFILE_TOKEN = os.getenv("PROFILE_TOKEN")
+PROFILE_SAMPLE_RATE = float(os.getenv("PROFILE_SAMPLE_RATE", 0.0))
+PROFILE_INTERVAL_MS = float(os.getenv("PROFILE_INTERVAL_MS", 1))
+PROFILE_MAX_SECONDS = float(os.getenv("PROFILE_MAX_SECONDS", 30))
+PROFILE_DIR = os.getenv("PROFILE_DIR", os.path.join(tempfile.gettempdir(), "profiles"))
+PROFILE_KEEP = int(os.getenv("PROFILE_KEEP", 50))
+
+# Leaf frames of threads parked on a lock, queue or selector.
+_IDLE = {("threading.py", "wait"), ("selectors.py", "select"), ("thread.py", "_worker")}
+
+
+class Sampler(threading.Thread):
+    """Records (thread name, stack) samples until stop()."""
+
+    def __init__(self, interval: float):
+        super().__init__(name="profile-sampler", daemon=True)
+        self.interval = interval
+        self.frames: Dict[tuple, int] = {}
+        # (thread name, root-first frame indexes) -> [sample count, ms]
+        self.stacks: Dict[tuple, list] = {}
+        self._done = threading.Event()
+
+    def _frame(self, frame) -> int:
+        code = frame.f_code
+        key = (getattr(code, "co_qualname", code.co_name), code.co_filename, code.co_firstlineno)
+        return self.frames.setdefault(key, len(self.frames))
+
+    def run(self):
+        own = threading.get_ident()
+        deadline = time.perf_counter() + PROFILE_MAX_SECONDS
+        last = time.perf_counter()
+        while not self._done.wait(self.interval) and last < deadline:
+            now = time.perf_counter()
+            elapsed, last = (now - last) * 1000, now
+            names = {t.ident: t.name for t in threading.enumerate()}
+            for ident, frame in sys._current_frames().items():
+                if ident == own or names.get(ident, "").startswith("profile-sampler"):
+                    continue
+                code = frame.f_code
+                if (os.path.basename(code.co_filename), code.co_name) in _IDLE:
+                    continue
+                stack = []
+                while frame is not None:
+                    stack.append(self._frame(frame))
+                    frame = frame.f_back
+                entry = self.stacks.setdefault((names.get(ident, str(ident)), tuple(reversed(stack))), [0, 0.0])
+                entry[0] += 1
+                entry[1] += elapsed
+
+    def stop(self):
+        self._done.set()
+        self.join()
+
+
+def speedscope(profile: dict) -> dict:
+    """The stored profile as a speedscope file, one sampled profile per thread."""
+    threads: Dict[str, dict] = {}
+    for thread, stack, _, ms in profile["stacks"]:
+        sampled = threads.setdefault(thread, {
+            "type": "sampled", "name": thread, "unit": "milliseconds",
+            "startValue": 0, "endValue": 0, "samples": [], "weights": [],
+        })
+        sampled["samples"].append(stack)
+        sampled["weights"].append(round(ms, 3))
+        sampled["endValue"] = round(sampled["endValue"] + ms, 3)
+    return {
+        "$schema": "https://www.speedscope.app/file-format-schema.json",
+        "name": f"{profile['method']} {profile['path']} ({profile['duration_ms']:.0f} ms)",
+        "shared": {"frames": [{"name": n, "file": f, "line": l} for n, f, l in profile["frames"]]},
+        "profiles": list(threads.values()),
+    }
+
+
+def collapsed(profile: dict) -> str:
+    """Brendan Gregg's folded stacks: ``thread;root;...;leaf count``."""
+    names = [f"{n} ({os.path.basename(f)}:{l})" for n, f, l in profile["frames"]]
+    lines = Counter()
+    for thread, stack, count, _ in profile["stacks"]:
+        lines[";".join([thread, *(names[i] for i in stack)])] += count
+    return "".join(f"{stack} {count}\n" for stack, count in lines.items())
+
+
+def _path(profile_id: str) -> str:
+    return os.path.join(PROFILE_DIR, f"{profile_id}.json")
+
+
+def _save(profile: dict):
+    os.makedirs(PROFILE_DIR, exist_ok=True)
+    tmp = _path(profile["id"]) + ".tmp"
+    with open(tmp, "w") as f:
+        json.dump(profile, f)
+    os.replace(tmp, _path(profile["id"]))
+    stored = sorted(
+        (entry for entry in os.scandir(PROFILE_DIR) if entry.name.endswith(".json")),
+        key=lambda entry: entry.stat().st_mtime, reverse=True,
+    )
+    for entry in stored[PROFILE_KEEP:]:
+        try:
+            os.unlink(entry.path)
+        except FileNotFoundError:  # another worker pruned it
+            pass
+
+
+def load(profile_id: str) -> Optional[dict]:
+    try:
+        uuid.UUID(profile_id)  # ids name files; don't let one escape PROFILE_DIR
+        with open(_path(profile_id)) as f:
+            return json.load(f)
+    except (ValueError, FileNotFoundError):
+        return None
+
+
+def summaries() -> List[dict]:
+    """Stored profiles without their samples, newest first."""
+    if not os.path.isdir(PROFILE_DIR):
+        return []
+    profiles = []
+    for entry in os.scandir(PROFILE_DIR):
+        if entry.name.endswith(".json") and (profile := load(entry.name[:-5])):
+            for key in ("frames", "stacks", "timeline"):
+                del profile[key]
+            profiles.append(profile)
+    return sorted(profiles, key=lambda p: p["started_at"], reverse=True)
+
+
+def _trigger(scope: Scope) -> Optional[str]:
+    if PROFILE_TOKEN:
+        header = Headers(scope=scope).get("x-profile")
+        if header and hmac.compare_digest(header, PROFILE_TOKEN):
+            return "header"
+    if PROFILE_SAMPLE_RATE and random.random() < PROFILE_SAMPLE_RATE:
+        return "sample"
+    return None
+
+
+class ProfilingMiddleware:
+    """Must sit inside query_stats_middleware, whose QueryStats carries the
+    SQL timeline."""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        trigger = _trigger(scope) if scope["type"] == "http" else None
+        if trigger is None:
+            await self.app(scope, receive, send)
+            return
+
+        profile_id = str(uuid.uuid4())
+        status = 500
+
+        async def send_with_id(message: Message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                MutableHeaders(scope=message)["X-Profile-Id"] = profile_id
+            await send(message)
+
+        stats = current_stats()
+        if stats is not None:
+            stats.timeline, stats.origin = [], time.perf_counter()
+        sampler = Sampler(PROFILE_INTERVAL_MS / 1000)
+        started_at, start = time.time(), time.perf_counter()
+        sampler.start()
+        try:
+            await self.app(scope, receive, send_with_id)
+        finally:
+            sampler.stop()
+            duration_ms = (time.perf_counter() - start) * 1000
+            timeline = stats.timeline if stats is not None else []
+            await run_in_threadpool(_save, {
+                "id": profile_id, "method": scope["method"], "path": scope["path"],
+                "query_string": scope["query_string"].decode("latin-1"), "status": status,
+                "trigger": trigger, "started_at": started_at, "duration_ms": round(duration_ms, 2),
+                "samples": sum(count for count, _ in sampler.stacks.values()),
+                "queries": len(timeline), "db_ms": round(sum(ms for _, ms, _ in timeline), 2),
+                "frames": list(sampler.frames),
+                "stacks": [[thread, list(stack), count, ms] for (thread, stack), (count, ms) in sampler.stacks.items()],
+                "timeline": [
+                    {"start_ms": round(offset, 3), "duration_ms": round(ms, 3), "statement": statement}
+                    for offset, ms, statement in timeline
+                ],
+            })
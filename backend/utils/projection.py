@@ -0,0 +1,118 @@
+"""Sparse fieldsets for profile payloads.
+
+``fields=name,enrollment_no,photo_thumb,is_ban`` limits the personal_info
+columns, ``include=marks`` the child collections (empty for none). The
+projection decides both the SQL (load_only columns, selectinload for
+included relationships, raiseload for the rest) and the response model, so
+unrequested data is neither fetched nor serialized.
+"""
+import hashlib
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import List, Optional, Tuple, Type
+
+from fastapi import HTTPException, Query
+from pydantic import BaseModel, ConfigDict, create_model
+from sqlalchemy.orm import contains_eager, load_only, raiseload, selectinload
+
+from models import PersonalInfo, Student
+from schema.profile import AchievementOut, CounselingOut, MarkOut, PersonalInfoOut, StudentProfileResponse
+
+PERSONAL_FIELDS = {name: field.annotation for name, field in PersonalInfoOut.model_fields.items()}
+PERSONAL_FIELDS["is_ban"] = Optional[bool]
+RELATIONS = {
+    "achievements": (Optional[AchievementOut], None),
+    "marks": (List[MarkOut], []),
+    "counseling": (List[CounselingOut], []),
+}
+
+
+@lru_cache(maxsize=256)
+def _response_model(fields: Optional[Tuple[str, ...]], include: Tuple[str, ...]) -> Type[BaseModel]:
+    config = ConfigDict(from_attributes=True)
+    personal = PersonalInfoOut if fields is None else create_model(
+        "PersonalInfoProjection", __config__=config,
+        **{name: (PERSONAL_FIELDS[name], None) for name in fields},
+    )
+    return create_model(
+        "StudentProfileProjection", __config__=config,
+        personal_info=(Optional[personal], None),
+        **{name: RELATIONS[name] for name in include},
+    )
+
+
+@dataclass(frozen=True)
+class Projection:
+    fields: Optional[Tuple[str, ...]] = None  # None: every PersonalInfoOut field
+    include: Tuple[str, ...] = tuple(RELATIONS)
+
+    @property
+    def is_full(self) -> bool:
+        return self.fields is None and self.include == tuple(RELATIONS)
+
+    @property
+    def tag(self) -> str:
+        """Short stable id for ETags of this representation."""
+        raw = f"{','.join(self.fields or ('*',))};{','.join(self.include)}"
+        return hashlib.sha1(raw.encode()).hexdigest()[:8]
+
+    @property
+    def model(self) -> Type[BaseModel]:
+        return StudentProfileResponse if self.is_full else _response_model(self.fields, self.include)
+
+    def _columns(self, *required):
+        names = dict.fromkeys((*required, *self.fields))
+        return [getattr(PersonalInfo, name) for name in names]
+
+    def _relations(self):
+        return [
+            selectinload(getattr(Student, name)) if name in self.include
+            else raiseload(getattr(Student, name))
+            for name in RELATIONS
+        ]
+
+    def student_options(self, *required_columns):
+        """Loader options for ``select(Student)`` joined to PersonalInfo."""
+        personal_info = contains_eager(Student.personal_info)
+        if self.fields is not None:
+            personal_info = personal_info.load_only(*self._columns("id", "student_id", *required_columns))
+        return [personal_info, *self._relations()]
+
+    def personal_info_options(self):
+        """Loader options for ``select(PersonalInfo)`` with its Student."""
+        options = [selectinload(PersonalInfo.student).options(*self._relations())]
+        if self.fields is not None:
+            options.append(load_only(*self._columns("id", "student_id")))
+        return options
+
+    def build(self, personal_info, student) -> BaseModel:
+        return self.model.model_validate({
+            "personal_info": personal_info,
+            **{name: getattr(student, name) for name in self.include},
+        })
+
+
+FULL = Projection()
+
+
+def _names(value: str, allowed, param: str) -> Tuple[str, ...]:
+    names = tuple(dict.fromkeys(n.strip() for n in value.split(",") if n.strip()))
+    unknown = [n for n in names if n not in allowed]
+    if unknown:
+        raise HTTPException(
+            status_code=422,
+            detail=f"Unknown {param}: {', '.join(unknown)}. Allowed: {', '.join(allowed)}",
+        )
+    return names
+
+
+def get_projection(
+    fields: Optional[str] = Query(None, description="Comma-separated personal_info fields, e.g. name,enrollment_no,photo_thumb,is_ban"),
+    include: Optional[str] = Query(None, description="Comma-separated child data: achievements,marks,counseling (empty for none)"),
+) -> Projection:
+    return Projection(
+        fields=None if fields is None else _names(fields, PERSONAL_FIELDS, "fields"),
+        include=tuple(RELATIONS) if include is None else tuple(
+            name for name in RELATIONS if name in _names(include, RELATIONS, "include")
+        ),
+    )
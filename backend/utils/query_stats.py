@@ -0,0 +1,103 @@
+import logging
+import os
+import random
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import List, Optional, Tuple
+
+from fastapi import Request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+QUERY_LOG_SAMPLE_RATE = float(os.getenv("QUERY_LOG_SAMPLE_RATE", 0.0))
+SLOW_QUERY_MS = float(os.getenv("SLOW_QUERY_MS", 200))
+SERVER_TIMING = os.getenv("SERVER_TIMING", "false").lower() == "true"
+
+logger = logging.getLogger("app.db")
+if not logger.handlers:
+    # Like SQLAlchemy's echo, make output visible without app-wide logging config.
+    handler = logging.StreamHandler()
+    handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(name)s %(message)s"))
+    logger.addHandler(handler)
+    logger.setLevel(logging.INFO)
+
+
+@dataclass
+class QueryStats:
+    count: int = 0
+    total_ms: float = 0.0
+    slowest_ms: float = 0.0
+    slowest_statement: Optional[str] = None
+    # Filled only while a request is profiled: (start offset ms, duration ms,
+    # statement) per query, offsets relative to ``origin``.
+    timeline: Optional[List[Tuple[float, float, str]]] = None
+    origin: float = field(default_factory=time.perf_counter)
+
+    def record(self, statement: str, elapsed_ms: float, started: Optional[float] = None):
+        self.count += 1
+        self.total_ms += elapsed_ms
+        if elapsed_ms > self.slowest_ms:
+            self.slowest_ms = elapsed_ms
+            self.slowest_statement = statement
+        if self.timeline is not None and started is not None:
+            self.timeline.append(((started - self.origin) * 1000, elapsed_ms, _one_line(statement, 2000)))
+
+
+_current: ContextVar[Optional[QueryStats]] = ContextVar("query_stats", default=None)
+
+
+def current_stats() -> Optional[QueryStats]:
+    return _current.get()
+
+
+def _one_line(statement: str, limit: int = 300) -> str:
+    statement = " ".join(statement.split())
+    return statement if len(statement) <= limit else statement[:limit] + "..."
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = conn.info["query_start"].pop()
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    stats = _current.get()
+    if stats is not None:
+        stats.record(statement, elapsed_ms, started)
+    if elapsed_ms >= SLOW_QUERY_MS:
+        logger.warning("slow_query ms=%.1f statement=%s", elapsed_ms, _one_line(statement))
+
+
+def instrument(engine: Engine):
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+
+async def query_stats_middleware(request: Request, call_next):
+    # The stats object is shared by reference, so queries run in the endpoint's
+    # task, threadpool or greenlet all land in it.
+    stats = QueryStats()
+    token = _current.set(stats)
+    try:
+        response = await call_next(request)
+    finally:
+        _current.reset(token)
+
+    if SERVER_TIMING:
+        response.headers.append(
+            "Server-Timing", f'db;dur={stats.total_ms:.1f};desc="{stats.count} queries"'
+        )
+    if QUERY_LOG_SAMPLE_RATE and random.random() < QUERY_LOG_SAMPLE_RATE:
+        logger.info(
+            "request method=%s path=%s status=%d queries=%d db_ms=%.1f slowest_ms=%.1f slowest=%s",
+            request.method,
+            request.url.path,
+            response.status_code,
+            stats.count,
+            stats.total_ms,
+            stats.slowest_ms,
+            _one_line(stats.slowest_statement or ""),
+        )
+    return response
@@ -0,0 +1,22 @@
+from typing import Any
+
+import orjson
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+from pydantic_core import to_json
+
+
+class FastJSONResponse(JSONResponse):
+    """JSON response encoded with orjson instead of the stdlib.
+
+    Routes that have already built their Pydantic models can return them
+    wrapped in this class: FastAPI doesn't re-validate a Response, and the
+    models are serialized straight to bytes by pydantic-core.
+    """
+
+    def render(self, content: Any) -> bytes:
+        if isinstance(content, BaseModel) or (
+            isinstance(content, list) and content and isinstance(content[0], BaseModel)
+        ):
+            return to_json(content)
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
@@ -0,0 +1,78 @@
+import os
+import shutil
+from abc import ABC, abstractmethod
+from typing import BinaryIO
+
+import cloudinary
+from cloudinary.uploader import upload_large
+from dotenv import load_dotenv
+
+load_dotenv()
+
+STORAGE_BACKEND = os.getenv("STORAGE_BACKEND", "cloudinary")
+UPLOAD_CHUNK_SIZE = int(os.getenv("UPLOAD_CHUNK_SIZE", 1024 * 1024))
+MEDIA_ROOT = os.getenv("MEDIA_ROOT", "media")
+MEDIA_URL = os.getenv("MEDIA_URL", "/media")
+
+
+class StorageBackend(ABC):
+    """Blocking storage API; callers run `save` off the event loop."""
+
+    @abstractmethod
+    def save(self, file: BinaryIO, key: str, content_type: str) -> str:
+        """Store ``file`` under ``key`` and return its public URL."""
+
+
+class CloudinaryStorage(StorageBackend):
+    def __init__(self):
+        cloudinary.config(
+            cloud_name=os.getenv("CLOUDINARY_CLOUD_NAME"),
+            api_key=os.getenv("CLOUDINARY_API_KEY"),
+            api_secret=os.getenv("CLOUDINARY_API_SECRET"),
+            secure=True
+        )
+
+    def save(self, file: BinaryIO, key: str, content_type: str) -> str:
+        result = upload_large(
+            file,
+            public_id=key,
+            overwrite=True,
+            resource_type="image",
+            chunk_size=max(UPLOAD_CHUNK_SIZE, 5 * 1024 * 1024),
+        )
+        return result.get("secure_url")
+
+
+class LocalStorage(StorageBackend):
+    EXTENSIONS = {"image/jpeg": ".jpg", "image/png": ".png", "image/webp": ".webp"}
+
+    def __init__(self, root: str = MEDIA_ROOT, base_url: str = MEDIA_URL):
+        self.root = root
+        self.base_url = base_url.rstrip("/")
+
+    def save(self, file: BinaryIO, key: str, content_type: str) -> str:
+        name = key + self.EXTENSIONS.get(content_type, "")
+        path = os.path.join(self.root, name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = path + ".part"
+        with open(tmp_path, "wb") as out:
+            shutil.copyfileobj(file, out, UPLOAD_CHUNK_SIZE)
+        os.replace(tmp_path, path)
+        return f"{self.base_url}/{name}"
+
+
+BACKENDS = {
+    "cloudinary": CloudinaryStorage,
+    "local": LocalStorage,
+}
+
+_storage = None
+
+
+def get_storage() -> StorageBackend:
+    global _storage
+    if _storage is None:
+        if STORAGE_BACKEND not in BACKENDS:
+            raise ValueError(f"Unknown STORAGE_BACKEND '{STORAGE_BACKEND}'")
+        _storage = BACKENDS[STORAGE_BACKEND]()
+    return _storage